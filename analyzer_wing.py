@@ -0,0 +1,184 @@
+from typing import List
+
+import streamlit as st
+
+import metrics
+from photo_upload import PhotoUploads, UploadError
+from triage import HUMAN_DRUG_WARNING, PHOTO_SIGNS, meds_for_systems, photo_heuristic, triage
+
+# ----------------------------
+# Medication education (data + heuristics in triage.py)
+# ----------------------------
+def render_recommended_meds(systems: List[str]):
+    if not systems:
+        st.write("No specific system detected from inputs.")
+        return
+
+    st.markdown("### 💊 Education-Only Medication Categories (Global)")
+    st.info(HUMAN_DRUG_WARNING)
+
+    for sys, meds in meds_for_systems(systems):
+        st.markdown(f"**Related System: {sys}**")
+        for title, examples in meds:
+            st.write(f"- **{title}:** {', '.join(examples)}")
+        st.caption("⚠️ These are common global categories. **Actual drug choice/dose requires a veterinarian.**")
+
+
+@st.cache_resource(show_spinner=False)
+def photo_uploads() -> PhotoUploads:
+    return PhotoUploads()
+
+
+def upload_preview(uploaded):
+    """Bounded preview for the current upload; hashed once per uploaded file."""
+    uploads = photo_uploads()
+    seen = st.session_state.get("photo_upload")
+    if seen and seen[0] == uploaded.file_id:
+        preview = uploads.get(seen[1])
+        if preview is not None:
+            return preview
+    preview = uploads.ingest(uploaded)
+    st.session_state["photo_upload"] = (uploaded.file_id, preview.digest)
+    return preview
+
+
+# ----------------------------
+# Analyzer tabs (fragments: each tab reruns on its own widgets)
+# ----------------------------
+@st.fragment
+def symptom_tab():
+    with metrics.fragment_run("analyzer_symptoms"):
+        with st.form("symptom_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                age = st.number_input("Dog age (years)", 0.0, 30.0, 3.0, 0.5)
+                size = st.selectbox("Dog size", ["Small", "Medium", "Large", "Giant", "Unknown"])
+            with col2:
+                vomit_diarrhea_hours = st.slider("Vomiting/diarrhea duration (hours)", 0, 72, 0)
+                appetite_loss_hours = st.slider("Not eating duration (hours)", 0, 72, 0)
+                limping_hours = st.slider("Limping duration (hours)", 0, 168, 0)
+
+            st.markdown("### Other observations")
+            itch_skin = st.checkbox("Strong itching / skin rash")
+            cough_sneeze = st.checkbox("Coughing / sneezing a lot")
+            eye_ear_pain = st.checkbox("Eye/ear pain or discharge")
+            blood_in_stool_vomit = st.checkbox("Blood in vomit or stool")
+
+            st.markdown("### Emergency signs (tick if yes)")
+            breathing_trouble = st.checkbox("Trouble breathing")
+            collapse_seizure = st.checkbox("Collapse / seizure")
+            bloated_hard_belly = st.checkbox("Bloated, hard belly")
+            uncontrolled_bleeding = st.checkbox("Uncontrolled bleeding")
+            cannot_urinate = st.checkbox("Cannot urinate")
+            heatstroke_like = st.checkbox("Heatstroke-like signs")
+
+            submitted = st.form_submit_button("Analyze")
+
+        if submitted:
+            sym = dict(
+                age=age, size=size,
+                vomit_diarrhea_hours=vomit_diarrhea_hours,
+                appetite_loss_hours=appetite_loss_hours,
+                limping_hours=limping_hours,
+                itch_skin=itch_skin, cough_sneeze=cough_sneeze, eye_ear_pain=eye_ear_pain,
+                blood_in_stool_vomit=blood_in_stool_vomit,
+                breathing_trouble=breathing_trouble, collapse_seizure=collapse_seizure,
+                bloated_hard_belly=bloated_hard_belly, uncontrolled_bleeding=uncontrolled_bleeding,
+                cannot_urinate=cannot_urinate, heatstroke_like=heatstroke_like
+            )
+
+            level, note, systems = triage(sym)
+            st.markdown('<div class="glass">', unsafe_allow_html=True)
+            st.markdown(f"## {level}")
+            st.markdown(note)
+
+            if systems:
+                st.markdown("### 🧠 Possible related systems (broad)")
+                for s in systems:
+                    st.write(f"- {s}")
+
+            st.markdown("### 💊 Medication Education (based on systems)")
+            render_recommended_meds(systems)
+
+            st.markdown("### 📌 What to record for the vet")
+            st.write(
+                "- Start time and progression\n"
+                "- Frequency per day\n"
+                "- Photos/videos\n"
+                "- Food/environment changes\n"
+                "- Any meds already given"
+            )
+            st.markdown("</div>", unsafe_allow_html=True)
+        metrics.lap("analyzer_symptoms")
+
+
+@st.fragment
+def photo_tab():
+    with metrics.fragment_run("analyzer_photo"):
+        st.markdown('<div class="glass-sm">Upload one symptom photo. We will analyze using a rule-based curator model.</div>',
+                    unsafe_allow_html=True)
+
+        uploaded = st.file_uploader("Upload symptom photo (jpg/png)", type=["jpg","jpeg","png"])
+        preview = None
+        if uploaded:
+            try:
+                preview = upload_preview(uploaded)
+            except UploadError as e:
+                st.error(f"⚠️ {e}. Please upload a smaller JPG/PNG.")
+            else:
+                w, h = preview.source_size
+                st.image(preview.data, use_container_width=True, caption=f"Original {w}×{h}")
+
+        photo_type = st.selectbox("What does the photo show?", list(PHOTO_SIGNS))
+
+        # Dynamic sign checklists
+        signs = st.multiselect("Visible signs", PHOTO_SIGNS.get(photo_type, []))
+        text_note = st.text_area("Extra description (optional)", placeholder="e.g., started 2 days ago, dog keeps scratching...")
+
+        if st.button("Analyze Photo"):
+            digest = preview.digest if preview else ""
+            possible_conditions, systems = photo_uploads().analysis(
+                digest, photo_type, signs, lambda: photo_heuristic(photo_type, signs))
+
+            st.markdown('<div class="glass">', unsafe_allow_html=True)
+            st.markdown("## 🧠 Photo-Assisted Summary (Educational)")
+
+            st.markdown("### Possible conditions (not diagnosis)")
+            for c in possible_conditions:
+                st.write(f"- {c}")
+
+            st.markdown("### Related systems")
+            for s in systems:
+                st.write(f"- {s}")
+
+            st.markdown("### 💊 Medication Education (based on systems)")
+            render_recommended_meds(systems)
+
+            st.info(
+                "If symptoms are severe, spreading fast, painful, or your dog seems weak → **vet visit is required**. "
+                "Photo tools cannot replace physical examination/lab tests."
+            )
+            st.markdown("</div>", unsafe_allow_html=True)
+        metrics.lap("analyzer_photo")
+
+
+# ----------------------------
+# Wing C: Symptom & Photo Analyzer (meds integrated)
+# ----------------------------
+def render():
+    st.markdown(
+        '<div class="glass"><h2>🩺 Symptom & Photo Analyzer Wing</h2>'
+        '<p style="opacity:0.9">Educational triage + photo-assisted observation. Not a diagnosis or prescription.</p></div>',
+        unsafe_allow_html=True
+    )
+    st.warning(
+        "⚠️ This tool provides **general education only**. It cannot diagnose disease or prescribe medication. "
+        "If your dog is very young/old, symptoms are severe, or worsening fast → see a vet."
+    )
+
+    tab1, tab2 = st.tabs(["🧾 Symptom Questionnaire", "📷 Photo-Assisted Analyzer"])
+
+    with tab1:
+        symptom_tab()
+    with tab2:
+        photo_tab()
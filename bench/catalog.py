@@ -0,0 +1,85 @@
+import json
+import random
+from typing import Any, Dict, List
+
+# ----------------------------
+# Synthetic TheDogAPI catalogs
+# ----------------------------
+# Shaped like GET /v1/breeds: same field names, "a - b" metric ranges, optional
+# image / reference_image_id, origins that are sometimes lists or empty.
+ORIGINS = (
+    "Germany", "France", "Japan", "England", "Scotland", "Russia", "United States", "Canada",
+    "Australia", "Egypt", "China", "Tibet", "Mexico", "Italy", "Hungary", "South Africa",
+    "Germany, France", "United Kingdom, England", "Belgium, Netherlands", "Siberia", "Peru",
+    "", "Unknown",
+)
+GROUPS = ("Sporting", "Hound", "Toy", "Working", "Herding", "Terrier", "Non-Sporting", "Mixed", None)
+TEMPERAMENTS = (
+    "Friendly", "Loyal", "Intelligent", "Alert", "Playful", "Calm", "Stubborn", "Energetic",
+    "Gentle", "Protective", "Independent", "Affectionate", "Courageous", "Reserved", "Curious",
+)
+ROLES = ("Hunting", "Herding", "Guarding", "Companionship", "Retrieving", "Sledding", "Ratting", "Lapdog")
+PREFIXES = ("Alpine", "Royal", "Coastal", "Highland", "Silken", "Northern", "Desert", "Imperial",
+            "Wirehaired", "Miniature", "Giant", "Smooth", "Long-haired", "Spotted", "Golden")
+BASES = ("Retriever", "Terrier", "Spaniel", "Shepherd", "Hound", "Mastiff", "Setter", "Pointer",
+         "Collie", "Spitz", "Poodle", "Bulldog", "Pinscher", "Schnauzer", "Laika")
+
+
+def synthetic_breeds(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """`n` unique, deterministic breed records."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(1, n + 1):
+        w = rng.randint(2, 70)
+        h = rng.randint(18, 85)
+        b: Dict[str, Any] = {
+            "id": i,
+            "name": f"{rng.choice(PREFIXES)} {rng.choice(BASES)} {i}",
+            "bred_for": ", ".join(rng.sample(ROLES, rng.randint(1, 2))),
+            "breed_group": rng.choice(GROUPS),
+            "life_span": f"{rng.randint(8, 12)} - {rng.randint(12, 17)} years",
+            "temperament": ", ".join(rng.sample(TEMPERAMENTS, rng.randint(3, 6))),
+            "origin": rng.choice(ORIGINS),
+            "weight": {"imperial": f"{w * 2} - {w * 2 + 10}", "metric": f"{w} - {w + rng.randint(1, 8)}"},
+            "height": {"imperial": f"{h // 2} - {h // 2 + 3}", "metric": f"{h} - {h + rng.randint(2, 10)}"},
+        }
+        if i % 5:
+            b["reference_image_id"] = f"ref{i:06d}"
+        if i % 3 == 0:
+            b["image"] = {"id": f"ref{i:06d}", "url": f"https://cdn2.thedogapi.com/images/ref{i:06d}.jpg"}
+        out.append(b)
+    return out
+
+
+def load_recorded(path: str) -> List[Dict[str, Any]]:
+    """A recorded /v1/breeds payload (JSON list), e.g. saved with curl."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a JSON list of breeds")
+    return data
+
+
+def scale_catalog(base: List[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+    """Repeat a recorded catalog up to `n` breeds, with unique ids and names."""
+    out = []
+    for i in range(n):
+        b = dict(base[i % len(base)])
+        copy = i // len(base)
+        b["id"] = i + 1
+        if copy:
+            b["name"] = f"{b.get('name', 'Breed')} {copy + 1}"
+        out.append(b)
+    return out
+
+
+def point_images_at(breeds: List[Dict[str, Any]], base_url: str) -> List[Dict[str, Any]]:
+    """Copy of `breeds` whose thumbnails are served by a MockUpstream at `base_url`."""
+    out = []
+    for b in breeds:
+        b = dict(b)
+        ref = b.get("reference_image_id") or (b.get("image") or {}).get("id")
+        if ref:
+            b["image"] = {"id": ref, "url": f"{base_url}/images/{ref}.jpg"}
+        out.append(b)
+    return out
@@ -0,0 +1,365 @@
+"""
+Headless load test: many concurrent visitors driving app.py in one process.
+
+    python -m bench.load --users 16 --duration 60
+    python -m bench.load --users 4 --duration 10 --breeds 2000 --latency 0.05
+
+Each visitor is a fresh Streamlit session (AppTest) running one scripted
+journey against a local MockUpstream. Reported: sessions/sec, rerun latency
+percentiles (overall and per step), heap per live session, process RSS and
+upstream calls made during the load phase.
+"""
+import argparse
+import gc
+import io
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from streamlit.testing.v1 import AppTest
+
+from bench.catalog import point_images_at, synthetic_breeds
+from bench.mock_upstream import MockUpstream
+from bench.run import percentile, random_symptoms
+from triage import PHOTO_SIGNS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+RUN_TIMEOUT = 60.0
+
+_compile_lock = threading.Lock()
+
+
+@contextmanager
+def concurrent_apptests(env: Optional[Dict[str, str]] = None) -> Iterator[None]:
+    """
+    AppTest is built for one test at a time; two process-wide spots break
+    when many run concurrently, so patch them while the block runs and
+    restore them on exit (along with os.environ, after applying `env`):
+    - each run installs a mock Runtime singleton and clears it when done,
+      which pulls it from under other sessions mid-run: keep the last one;
+    - each AppTest compiles app.py on its first run, and concurrent ast.parse
+      can fail on CPython 3.11 ("AST constructor recursion depth mismatch").
+    """
+    import streamlit
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner import magic
+
+    missing = [name for owner, name in ((Runtime, "_instance"), (Runtime, "instance"), (Runtime, "exists"),
+                                        (magic, "add_magic")) if not hasattr(owner, name)]
+    if missing:
+        raise RuntimeError(f"bench.load: Streamlit {streamlit.__version__} lacks the internals it patches "
+                           f"for concurrent sessions ({', '.join(missing)}); pin a compatible version")
+
+    add_magic = magic.add_magic
+    saved = {name: Runtime.__dict__[name] for name in ("instance", "exists")}
+    last: List[Any] = [None]
+
+    def locked(code: str, script_path: str):
+        with _compile_lock:
+            return add_magic(code, script_path)
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[0] = cls._instance
+        if last[0] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    saved_env = dict(os.environ)
+    os.environ.update(env or {})
+    magic.add_magic = locked
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or last[0] is not None)
+    try:
+        yield
+    finally:
+        magic.add_magic = add_magic
+        for name, attr in saved.items():
+            setattr(Runtime, name, attr)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+# ----------------------------
+# Visitor journeys
+# ----------------------------
+class Visitor:
+    """One session; every step is one timed rerun."""
+
+    def __init__(self, rng: random.Random, record: Callable[[str, float, bool], None]):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        self.rng = rng
+        self.record = record
+
+    def step(self, name: str, widget: Any = None):
+        t0 = time.perf_counter()
+        (widget or self.at).run()
+        self.record(name, time.perf_counter() - t0, bool(self.at.exception))
+
+    def by_label(self, kind: str, prefix: str) -> Any:
+        for w in getattr(self.at, kind):
+            if w.label.startswith(prefix):
+                return w
+        raise LookupError(f"no {kind} labelled {prefix!r}")
+
+    def wing(self, name: str):
+        self.step(f"open:{name}", self.at.radio(key="mode").set_value(name))
+
+
+def gallery_journey(v: Visitor):
+    v.step("open")
+    box = v.by_label("selectbox", "🎨 Select a breed")
+    v.step("pick_breed", box.set_value(v.rng.choice(box.options[:50])))
+    query = v.rng.choice(("retr", "terier", "friendly", "germany", "alpine", "spitz"))
+    v.step("search", v.at.sidebar.text_input[0].set_value(query))
+    v.step("clear_search", v.at.sidebar.text_input[0].set_value(""))
+    size = v.rng.choice(["All"] + [o.rsplit(" (", 1)[0] for o in v.at.selectbox(key="f_size").options[1:]])
+    v.step("facet", v.at.selectbox(key="f_size").set_value(size))
+    for _ in range(v.rng.randint(1, 3)):
+        nxt = v.at.button(key="wall_next")
+        if nxt.disabled:
+            break
+        v.step("wall_next", nxt.click())
+
+
+def body_parts_journey(v: Visitor):
+    v.step("open")
+    v.wing("Body Parts Explorer")
+    box = v.by_label("selectbox", "Choose a body part")
+    for part in v.rng.sample(box.options, 3):
+        v.step("body_part", v.by_label("selectbox", "Choose a body part").set_value(part))
+
+
+def symptom_journey(v: Visitor):
+    v.step("open")
+    v.wing("Symptom & Photo Analyzer")
+    sym = random_symptoms(v.rng)
+    labels = {
+        "itch_skin": "Strong itching", "cough_sneeze": "Coughing", "eye_ear_pain": "Eye/ear pain",
+        "blood_in_stool_vomit": "Blood in vomit", "breathing_trouble": "Trouble breathing",
+        "collapse_seizure": "Collapse", "bloated_hard_belly": "Bloated", "uncontrolled_bleeding": "Uncontrolled",
+        "cannot_urinate": "Cannot urinate", "heatstroke_like": "Heatstroke",
+    }
+    for key, prefix in labels.items():
+        if sym[key]:
+            v.by_label("checkbox", prefix).check()
+    v.by_label("slider", "Vomiting/diarrhea").set_value(sym["vomit_diarrhea_hours"])
+    v.by_label("slider", "Limping").set_value(sym["limping_hours"])
+    v.step("submit_symptoms", v.by_label("button", "Analyze").click())
+
+
+def photo_journey(v: Visitor, jpeg: bytes):
+    v.step("open")
+    v.wing("Symptom & Photo Analyzer")
+    v.step("upload_photo", v.at.file_uploader[0].set_value(("symptom.jpg", jpeg, "image/jpeg")))
+    photo_type = v.rng.choice(list(PHOTO_SIGNS))
+    v.step("photo_type", v.by_label("selectbox", "What does the photo show?").set_value(photo_type))
+    options = PHOTO_SIGNS[photo_type]
+    v.by_label("multiselect", "Visible signs").set_value(v.rng.sample(options, v.rng.randint(1, len(options))))
+    v.step("analyze_photo", v.by_label("button", "Analyze Photo").click())
+
+
+def sample_photo(seed: int) -> bytes:
+    from PIL import Image
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1600, 1200), tuple(rng.randrange(256) for _ in range(3)))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+# ----------------------------
+# Measurement
+# ----------------------------
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, Linux units
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.examples: Dict[str, str] = {}
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def rerun(self, step: str, seconds: float, failed: bool):
+        with self._lock:
+            self.samples[step].append(seconds)
+            if failed:
+                self.errors[step] += 1
+
+    def session_done(self, journey: str, error: Optional[BaseException]):
+        with self._lock:
+            self.sessions += 1
+            if error is not None:
+                # Failures inside AppTest itself (it is not built for concurrent
+                # sessions) are counted apart from app errors.
+                frames = traceback.extract_tb(error.__traceback__)
+                origin = "harness" if frames and "streamlit/testing" in frames[-1].filename else "journey"
+                key = f"{origin}:{journey}:{type(error).__name__}"
+                self.errors[key] += 1
+                self.examples.setdefault(key, "".join(traceback.format_exception(error)[-3:]))
+
+
+def memory_per_session(count: int, seed: int) -> float:
+    """Python heap growth per live session, after each has rendered the gallery once."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for i in range(count):
+        v = Visitor(random.Random(seed + i), lambda *a: None)
+        v.at.run()
+        live.append(v)
+    gc.collect()
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return grown / max(1, count)
+
+# ----------------------------
+# Driver
+# ----------------------------
+def run(users: int, duration: float, breeds: int, latency: float, error_rate: float,
+        weights: Dict[str, float], mem_sessions: int, seed: int) -> Dict[str, Any]:
+    tmp = tempfile.mkdtemp(prefix="dog-museum-load-")
+    upstream = MockUpstream([], latency=latency, error_rate=error_rate, seed=seed).start()
+    upstream.set_breeds(point_images_at(synthetic_breeds(breeds, seed), upstream.base_url))
+    env = {
+        "DOG_API_BASE": upstream.base_url,
+        "DOG_CEO_BASE": upstream.base_url,
+        "BREEDS_SNAPSHOT_PATH": os.path.join(tmp, "breeds.snapshot"),
+        "FETCH_CACHE_PATH": os.path.join(tmp, "fetch-cache.sqlite3"),
+        "IMAGE_CACHE_DIR": os.path.join(tmp, "images"),
+        "THUMB_DIR": os.path.join(tmp, "thumbs"),
+    }
+    jpeg = sample_photo(seed)
+    journeys: Dict[str, Callable[[Visitor], None]] = {
+        "gallery": gallery_journey,
+        "body_parts": body_parts_journey,
+        "symptoms": symptom_journey,
+        "photo": lambda v: photo_journey(v, jpeg),
+    }
+    names = [n for n in journeys if weights.get(n, 0) > 0]
+    with concurrent_apptests(env):
+        # Cold start: first session pays for the breed fetch and table build.
+        t0 = time.perf_counter()
+        AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT).run()
+        cold = time.perf_counter() - t0
+        # Measured before the load so the warm caches are shared, not per session.
+        per_session = memory_per_session(mem_sessions, seed) if mem_sessions else 0.0
+        upstream.calls.clear()
+
+        rec = Recorder()
+        stop_at = time.perf_counter() + duration
+
+        def worker(i: int):
+            rng = random.Random(seed * 1000 + i)
+            while time.perf_counter() < stop_at:
+                name = rng.choices(names, [weights[n] for n in names])[0]
+                err = None
+                try:
+                    journeys[name](Visitor(rng, rec.rerun))
+                except Exception as e:  # a broken journey is a result, not a crash
+                    err = e
+                rec.session_done(name, err)
+
+        threads = [threading.Thread(target=worker, args=(i,), name=f"visitor-{i}") for i in range(users)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+    calls_during_load = dict(upstream.calls)
+
+    upstream.stop()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    all_samples = sorted(s for v in rec.samples.values() for s in v)
+    return {
+        "users": users, "duration_s": round(elapsed, 2), "breeds": breeds,
+        "upstream_latency_s": latency, "cold_start_s": round(cold, 3),
+        "sessions": rec.sessions, "sessions_per_s": round(rec.sessions / elapsed, 2),
+        "reruns": len(all_samples), "reruns_per_s": round(len(all_samples) / elapsed, 2),
+        "rerun_p50_ms": round(percentile(all_samples, 0.50) * 1000, 1),
+        "rerun_p95_ms": round(percentile(all_samples, 0.95) * 1000, 1),
+        "rerun_p99_ms": round(percentile(all_samples, 0.99) * 1000, 1),
+        "steps": {
+            step: {"n": len(v), "p50_ms": round(percentile(sorted(v), 0.5) * 1000, 1),
+                   "p99_ms": round(percentile(sorted(v), 0.99) * 1000, 1)}
+            for step, v in sorted(rec.samples.items())
+        },
+        "errors": dict(rec.errors),
+        "error_examples": dict(rec.examples),
+        "heap_per_session_mb": round(per_session / 2 ** 20, 2),
+        "rss_mb": round(rss_bytes() / 2 ** 20, 1),
+        "upstream_calls": calls_during_load,
+    }
+
+
+def print_report(r: Dict[str, Any]):
+    print(f"users {r['users']} · {r['duration_s']}s · {r['breeds']} breeds · upstream latency {r['upstream_latency_s']}s")
+    print(f"cold start        {r['cold_start_s']:.2f}s")
+    print(f"sessions          {r['sessions']} ({r['sessions_per_s']}/s)")
+    print(f"reruns            {r['reruns']} ({r['reruns_per_s']}/s)  "
+          f"p50 {r['rerun_p50_ms']} ms  p95 {r['rerun_p95_ms']} ms  p99 {r['rerun_p99_ms']} ms")
+    print(f"memory            {r['heap_per_session_mb']} MB heap/session, {r['rss_mb']} MB RSS")
+    print("upstream calls    " + ", ".join(f"{k} {v}" for k, v in sorted(r["upstream_calls"].items())))
+    print(f"\n{'step':<28} {'n':>6} {'p50 ms':>9} {'p99 ms':>9}")
+    for step, s in r["steps"].items():
+        print(f"{step:<28} {s['n']:>6} {s['p50_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+    if r["errors"]:
+        print("\nerrors:")
+        for k, v in sorted(r["errors"].items()):
+            print(f"  {k} x{v}  {r['error_examples'].get(k, '')}")
+
+
+def parse_weights(text: str) -> Dict[str, float]:
+    out = {}
+    for part in text.split(","):
+        name, _, w = part.partition("=")
+        out[name.strip()] = float(w or 1)
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    ap = argparse.ArgumentParser(description="Dog Museum headless load test")
+    ap.add_argument("--users", type=int, default=8, help="concurrent visitors")
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    ap.add_argument("--breeds", type=int, default=300, help="synthetic catalog size")
+    ap.add_argument("--latency", type=float, default=0.02, help="mock upstream latency (s)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of mock upstream 503s")
+    ap.add_argument("--mix", default="gallery=5,body_parts=1,symptoms=2,photo=2",
+                    help="journey weights, e.g. gallery=5,photo=1")
+    ap.add_argument("--mem-sessions", type=int, default=10, help="sessions held live for the memory estimate")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", dest="json_path", help="append the report as one JSON line")
+    args = ap.parse_args(argv)
+    logging.disable(logging.WARNING)  # per-rerun deprecation / bare-mode warnings
+
+    report = run(args.users, args.duration, args.breeds, args.latency, args.error_rate,
+                 parse_weights(args.mix), args.mem_sessions, args.seed)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": time.time(), **report}) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
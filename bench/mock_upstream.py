@@ -0,0 +1,120 @@
+import io
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# ----------------------------
+# Local stand-ins for TheDogAPI and dog.ceo
+# ----------------------------
+# One HTTP server answers both APIs' routes used by the app:
+#   GET /v1/breeds                        TheDogAPI catalog
+#   GET /v1/images/search?breed_id&limit  TheDogAPI breed photos
+#   GET /api/breeds/image/random/<n>      dog.ceo random photos
+#   GET /images/<name>.jpg                image bytes (one small JPEG)
+
+
+def _tiny_jpeg() -> bytes:
+    try:
+        from PIL import Image
+    except ImportError:
+        return b"\xff\xd8\xff\xd9"
+    buf = io.BytesIO()
+    Image.new("RGB", (640, 480), (180, 140, 60)).save(buf, "JPEG", quality=70)
+    return buf.getvalue()
+
+
+class MockUpstream:
+    """
+    Threaded local server with configurable latency and failure rate.
+
+    `calls` counts requests per route ("breeds", "images_search",
+    "random", "image", "other") so callers can check upstream amplification.
+    """
+
+    def __init__(self, breeds: List[Dict[str, Any]], latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.set_breeds(breeds)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._jpeg = _tiny_jpeg()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def set_breeds(self, breeds: List[Dict[str, Any]]):
+        self.breeds_body = json.dumps(breeds).encode()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockUpstream":
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                mock._handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mock-upstream", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockUpstream":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _route(self, path: str, query: Dict[str, List[str]]):
+        if path == "/v1/breeds":
+            return "breeds", "application/json", self.breeds_body
+        if path == "/v1/images/search":
+            bid = query.get("breed_id", ["0"])[0]
+            limit = int(query.get("limit", ["1"])[0])
+            body = [{"id": f"b{bid}_{k}", "url": f"{self.base_url}/images/b{bid}_{k}.jpg"} for k in range(limit)]
+            return "images_search", "application/json", json.dumps(body).encode()
+        if path.startswith("/api/breeds/image/random/"):
+            n = int(path.rsplit("/", 1)[1])
+            with self._lock:
+                picks = [self._rng.randrange(10_000) for _ in range(n)]
+            body = {"status": "success", "message": [f"{self.base_url}/images/r{p}.jpg" for p in picks]}
+            return "random", "application/json", json.dumps(body).encode()
+        if path.startswith("/images/"):
+            return "image", "image/jpeg", self._jpeg
+        return "other", "application/json", b'{"message":"not found"}'
+
+    def _handle(self, req: BaseHTTPRequestHandler):
+        parts = urlsplit(req.path)
+        route, ctype, body = self._route(parts.path, parse_qs(parts.query))
+        with self._lock:
+            self.calls[route] += 1
+            fail = self.error_rate and self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        status = 503 if fail else (404 if route == "other" else 200)
+        if fail:
+            body = b'{"message":"unavailable"}'
+        req.send_response(status)
+        req.send_header("Content-Type", ctype)
+        req.send_header("Content-Length", str(len(body)))
+        req.end_headers()
+        req.wfile.write(body)
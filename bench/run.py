@@ -0,0 +1,250 @@
+"""
+Offline benchmark suite.
+
+    python -m bench.run                      # 200 .. 50,000 breeds
+    python -m bench.run --quick              # smoke run, small catalogs
+    python -m bench.run --json bench.jsonl   # append results for tracking
+    python -m bench.run --recorded breeds.json --cases enrich,gallery_filter
+
+Upstream calls go to a local MockUpstream, so no network is needed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from bench.catalog import load_recorded, scale_catalog, synthetic_breeds
+from bench.mock_upstream import MockUpstream
+from breed_data import BreedTable, RegionMatcher, filter_rows, origin_to_region
+from breed_search import SEARCH_RESULTS, BreedSearch
+from breed_similar import BreedNeighbors, feature_matrix
+from breed_stats import GROUP_BY, METRICS, BreedStats
+from http_client import HttpClient
+from rendering import WALL_PAGE_SIZE, exhibit_panel, wall_html
+from triage import PHOTO_SIGNS, photo_heuristic, photo_heuristic_batch, triage
+from triage_rules import load_rules
+
+DEFAULT_SIZES = (200, 1000, 5000, 20000, 50000)
+QUICK_SIZES = (200, 2000)
+TRIAGE_BATCH = 4096  # questionnaires / sign sets per vectorized batch
+
+SYMPTOM_FLAGS = (
+    "itch_skin", "cough_sneeze", "eye_ear_pain", "blood_in_stool_vomit", "breathing_trouble",
+    "collapse_seizure", "bloated_hard_belly", "uncontrolled_bleeding", "cannot_urinate", "heatstroke_like",
+)
+SYMPTOM_HOURS = (("vomit_diarrhea_hours", 72), ("appetite_loss_hours", 72), ("limping_hours", 168))
+
+# ----------------------------
+# Measurement
+# ----------------------------
+Op = Callable[[], Any]
+
+
+def measure(ops: Sequence[Op], budget: float, min_ops: int = 3, max_ops: int = 200_000) -> List[float]:
+    """Run ops round-robin for ~`budget` seconds; per-op latencies in seconds."""
+    samples: List[float] = []
+    clock = time.perf_counter
+    deadline = clock() + budget
+    i = 0
+    while len(samples) < max_ops and (len(samples) < min_ops or clock() < deadline):
+        op = ops[i % len(ops)]
+        t0 = clock()
+        op()
+        samples.append(clock() - t0)
+        i += 1
+    return samples
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = min(len(sorted_samples) - 1, max(0, int(round(q * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[k]
+
+
+def summarize(case: str, n: int, items: int, samples: List[float]) -> Dict[str, Any]:
+    s = sorted(samples)
+    total = sum(s) or 1e-12
+    return {
+        "case": case, "breeds": n, "ops": len(s),
+        "ops_per_s": round(len(s) / total, 1),
+        "items_per_s": round(len(s) * items / total, 1),
+        "p50_us": round(percentile(s, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(s, 0.99) * 1e6, 2),
+    }
+
+# ----------------------------
+# Workloads
+# ----------------------------
+def random_symptoms(rng: random.Random) -> Dict[str, Any]:
+    sym: Dict[str, Any] = {k: rng.random() < 0.15 for k in SYMPTOM_FLAGS}
+    for k, hi in SYMPTOM_HOURS:
+        sym[k] = rng.choice((0, 0, rng.randint(1, hi)))
+    return sym
+
+
+def random_photo(rng: random.Random) -> Tuple[str, List[str]]:
+    photo_type = rng.choice(list(PHOTO_SIGNS))
+    options = PHOTO_SIGNS[photo_type]
+    return photo_type, rng.sample(options, rng.randint(0, len(options)))
+
+
+def search_queries(table: BreedTable, rng: random.Random, count: int = 64) -> List[str]:
+    out = []
+    for _ in range(count):
+        name = table.names_lower[rng.randrange(len(table))]
+        kind = rng.random()
+        if kind < 0.4:
+            out.append(name.split()[0][:rng.randint(3, 8)])
+        elif kind < 0.7:
+            i = rng.randrange(max(1, len(name) - 1))
+            out.append(name[:i] + name[i + 1:i + 2] + name[i:i + 1] + name[i + 2:])  # transposition typo
+        else:
+            out.append(rng.choice(("friendly", "loyal", "herding", "germany", "japan", "guard", "calm")))
+    return out
+
+
+def gallery_filter(table: BreedTable, search: BreedSearch, keyword: str,
+                   r_code: int, g_code: int, s_code: int) -> List[int]:
+    # The Breed Gallery sidebar: keyword ranking, then facet counts and result rows.
+    ranked = [r for r, _ in search.search(keyword, k=SEARCH_RESULTS)] if keyword else None
+    matched_bits = search.match_bits(keyword) if keyword else None
+    return filter_rows(table, ranked, r_code, g_code, s_code, matched_bits).rows
+
+
+def build_cases(breeds: List[Dict[str, Any]], upstream: MockUpstream, client: HttpClient,
+                rng: random.Random) -> Dict[str, Tuple[int, bool, Callable[[], List[Op]]]]:
+    """case -> (items per op, depends on catalog size, factory of ops)."""
+    n = len(breeds)
+    table = BreedTable(breeds, version="bench")
+    search = BreedSearch(table, cache_size=512)
+    cold_search = BreedSearch(table, cache_size=0)
+    origins = [b.get("origin", "") for b in breeds]
+    matcher = RegionMatcher()  # uncached, unlike origin_to_region
+    pages = [tuple(range(i, min(i + WALL_PAGE_SIZE, n))) for i in range(0, n, WALL_PAGE_SIZE)][:256]
+
+    def filters() -> List[Op]:
+        queries = search_queries(table, rng, 16) + [""] * 16
+        ops = []
+        for q in queries:
+            codes = [rng.choice([-1, -1] + list(range(len(labels))))
+                     for labels in (table.region_labels, table.group_labels, table.size_labels)]
+            ops.append(lambda q=q, c=codes: gallery_filter(table, search, q, *c))
+        return ops
+
+    def triage_batches() -> List[Op]:
+        rules = load_rules()
+        ops = []
+        for _ in range(8):
+            recs = [random_symptoms(rng) for _ in range(TRIAGE_BATCH)]
+            cols = {f: [r[f] for r in recs] for f in rules.fields}
+            ops.append(lambda c=cols: rules.evaluate_batch(c))
+        return ops
+
+    def stats_ops() -> List[Op]:
+        stats = BreedStats(table)
+        ops = []
+        for _ in range(16):
+            sizes = tuple(rng.sample(range(len(table.size_labels)), rng.randint(0, len(table.size_labels))))
+            metric, by = rng.choice(METRICS), rng.choice(GROUP_BY)
+            ops.append(lambda m=metric, b=by, s=sizes: stats.summary(m, b, stats.mask(sizes=s)))
+        return ops
+
+    def similar_ops() -> List[Op]:
+        nb = BreedNeighbors(table)
+        return [lambda r=r: nb.similar(r) for r in rng.sample(range(n), min(n, 4096))]
+
+    def origin_ops() -> List[Op]:
+        origin_to_region.cache_clear()
+        return [lambda o=o: origin_to_region(o) for o in origins[:4096]]
+
+    return {
+        "fetch_breeds": (n, True, lambda: [lambda: client.get_json(f"{upstream.base_url}/v1/breeds")]),
+        "enrich": (n, True, lambda: [lambda: BreedTable(breeds, version="bench")]),
+        "search_index": (n, True, lambda: [lambda: BreedSearch(table)]),
+        "search": (1, True, lambda: [lambda q=q: cold_search.search(q, k=SEARCH_RESULTS)
+                                     for q in search_queries(table, rng)]),
+        "gallery_filter": (1, True, filters),
+        "catalog_stats": (n, True, stats_ops),
+        "similar_features": (n, True, lambda: [lambda: feature_matrix(table)]),
+        # Neighbor lists are not prebuilt here: the first pass over the rows is
+        # the on-demand matrix-vector path, later passes the precomputed one.
+        "similar": (1, True, similar_ops),
+        "origin_to_region": (1, False, origin_ops),
+        "region_classify": (1, False, lambda: [lambda o=o: matcher.classify(o) for o in origins[:4096]]),
+        "exhibit_panel": (1, False, lambda: [lambda r=r: exhibit_panel(table, r) for r in range(min(n, 4096))]),
+        "wall_html": (WALL_PAGE_SIZE, False, lambda: [lambda p=p: wall_html(table, p, [table.thumb_urls[r] for r in p])
+                                                      for p in pages]),
+        "triage": (1, False, lambda: [lambda s=random_symptoms(rng): triage(s) for _ in range(512)]),
+        "triage_batch": (TRIAGE_BATCH, False, triage_batches),
+        "photo_heuristic": (1, False, lambda: [lambda p=random_photo(rng): photo_heuristic(*p) for _ in range(512)]),
+        "photo_batch": (TRIAGE_BATCH, False, lambda: [lambda b=[random_photo(rng) for _ in range(TRIAGE_BATCH)]:
+                                                       photo_heuristic_batch(b) for _ in range(8)]),
+    }
+
+# ----------------------------
+# Driver
+# ----------------------------
+def git_rev() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run(sizes: Sequence[int], cases: Optional[Sequence[str]], budget: float,
+        recorded: Optional[str], seed: int) -> List[Dict[str, Any]]:
+    base = load_recorded(recorded) if recorded else None
+    client = HttpClient(max_retries=0, per_host_limit=4)
+    results: List[Dict[str, Any]] = []
+    for idx, n in enumerate(sizes):
+        breeds = scale_catalog(base, n) if base else synthetic_breeds(n, seed)
+        rng = random.Random(seed)
+        with MockUpstream(breeds) as upstream:
+            for name, (items, scales, factory) in build_cases(breeds, upstream, client, rng).items():
+                if cases and name not in cases:
+                    continue
+                if not scales and idx > 0:
+                    continue  # per-item cost does not depend on catalog size
+                r = summarize(name, n, items, measure(factory(), budget))
+                results.append(r)
+                print(f"{r['case']:<18} {r['breeds']:>7} {r['ops']:>8} {r['items_per_s']:>14,.0f}"
+                      f" {r['p50_us']:>12,.1f} {r['p99_us']:>12,.1f}", flush=True)
+    client.close()
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    ap = argparse.ArgumentParser(description="Dog Museum offline benchmarks")
+    ap.add_argument("--sizes", help="comma-separated catalog sizes (default 200..50000)")
+    ap.add_argument("--cases", help="comma-separated case names (default: all)")
+    ap.add_argument("--budget", type=float, default=1.0, help="seconds per case and size")
+    ap.add_argument("--quick", action="store_true", help="small catalogs, short budget")
+    ap.add_argument("--recorded", help="recorded /v1/breeds JSON to scale instead of synthetic data")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", dest="json_path", help="append one JSON line per result to this file")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    budget = min(args.budget, 0.2) if args.quick else args.budget
+    cases = args.cases.split(",") if args.cases else None
+
+    print(f"{'case':<18} {'breeds':>7} {'ops':>8} {'items/s':>14} {'p50 us':>12} {'p99 us':>12}")
+    results = run(sizes, cases, budget, args.recorded, args.seed)
+
+    if args.json_path:
+        meta = {"ts": time.time(), "rev": git_rev(), "python": platform.python_version()}
+        with open(args.json_path, "a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps({**meta, **r}) + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import streamlit as st
+
+import metrics
+
+# ----------------------------
+# Body Parts data (no images)
+# ----------------------------
+BODY_PARTS = {
+    "Eyes": {
+        "normal": ["Clear, bright eyes", "No thick discharge", "Not squinting"],
+        "watch_for": ["Yellow/green discharge", "Redness/swelling", "Cloudy haze", "Constant squinting"],
+        "meaning": "Eyes can reflect allergy, infection, injury, or age-related change."
+    },
+    "Ears": {
+        "normal": ["Light pink, no strong smell", "Minimal wax"],
+        "watch_for": ["Bad odor", "Brown/black debris", "Head shaking", "Pain when touched"],
+        "meaning": "Ear problems are common and often allergy/infection related."
+    },
+    "Mouth / Teeth": {
+        "normal": ["Pink gums", "Clean teeth", "No constant drooling"],
+        "watch_for": ["Red gums/bleeding", "Bad breath", "Broken tooth", "Refuses food"],
+        "meaning": "Dental disease is frequent in dogs—gums and tartar matter."
+    },
+    "Skin / Coat": {
+        "normal": ["Shiny coat", "No bald patches", "No intense itch"],
+        "watch_for": ["Hot spots", "Dandruff", "Bumps/lumps", "Heavy scratching"],
+        "meaning": "Skin shows allergy, parasites, infection, or hormonal issues."
+    },
+    "Paws / Nails": {
+        "normal": ["Pads not cracked", "Nails not overgrown", "No limping"],
+        "watch_for": ["Limping", "Bleeding nail", "Constant licking", "Swollen toes"],
+        "meaning": "Paws reveal injury, arthritis, foreign bodies, or dermatitis."
+    },
+    "Stomach / Digestion": {
+        "normal": ["Not bloated", "Regular poop", "Normal appetite"],
+        "watch_for": ["Hard bloated belly", "Repeated vomiting", "Black/bloody stool"],
+        "meaning": "GI signs range from mild upset to emergencies."
+    },
+}
+
+
+# ----------------------------
+# Wing B: Body Parts Explorer
+# ----------------------------
+@st.fragment
+def body_part_panel():
+    # Switching body parts reruns only this panel.
+    with metrics.fragment_run("body_parts"):
+        part = st.selectbox("Choose a body part", list(BODY_PARTS.keys()))
+        info = BODY_PARTS[part]
+
+        st.markdown('<div class="glass">', unsafe_allow_html=True)
+        st.markdown(f"## {part}")
+
+        st.markdown("### ✅ What looks normal")
+        for x in info["normal"]:
+            st.write(f"- {x}")
+
+        st.markdown("### ⚠️ What to watch for")
+        for x in info["watch_for"]:
+            st.write(f"- {x}")
+
+        st.markdown("### 🧑‍🎨 Curator Note")
+        st.write(info["meaning"])
+        st.info("Severe pain / rapid worsening / multiple abnormal signs → consult a veterinarian.")
+        st.markdown("</div>", unsafe_allow_html=True)
+        metrics.lap("body_parts")
+
+
+def render():
+    st.markdown(
+        '<div class="glass"><h2>🔍 Body Parts Explorer Wing</h2>'
+        '<p style="opacity:0.9">Observe dogs by anatomy like a curator studying a masterpiece.</p></div>',
+        unsafe_allow_html=True
+    )
+
+    body_part_panel()
@@ -0,0 +1,360 @@
+import math
+import re
+from functools import lru_cache
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# ----------------------------
+# Origin -> Department
+# ----------------------------
+# Earlier regions win when one keyword is listed twice ("russia").
+REGION_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Asia Gallery", ("japan","china","korea","tibet","thailand","vietnam","india","mongolia","siberia","russia","nepal","iran","israel")),
+    ("Europe Gallery", ("england","scotland","ireland","wales","france","germany","italy","spain","portugal","sweden","norway","finland","denmark",
+                        "netherlands","belgium","switzerland","austria","poland","hungary","czech","slovakia","croatia","serbia","greece","romania",
+                        "bulgaria","ukraine","russia","turkey")),
+    ("Americas Gallery", ("united states","usa","america","canada","mexico","brazil","argentina","chile","peru","colombia","uruguay")),
+    ("Africa Gallery", ("africa","egypt","morocco","mali","kenya","ethiopia","tunisia","algeria","nigeria","south africa")),
+    ("Oceania Gallery", ("australia","new zealand","tasmania")),
+)
+UNKNOWN_REGION = "Unknown / Global"
+
+
+class RegionMatcher:
+    """
+    Aho–Corasick automaton over all region keywords.
+
+    classify() scans the lowercased origin once. Among all keyword hits the
+    winner is the one that starts earliest (the first country listed in
+    "Germany, France"), then the longest ("south africa" over "africa"),
+    then the region listed first in REGION_KEYWORDS.
+    """
+
+    def __init__(self, regions: Sequence[Tuple[str, Sequence[str]]] = REGION_KEYWORDS):
+        self.labels = tuple(r for r, _ in regions)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[Tuple[int, int]]] = [[]]  # state -> [(keyword_len, region_idx)]
+        seen: Dict[str, int] = {}
+        for prio, (_, words) in enumerate(regions):
+            for w in words:
+                if w in seen:
+                    continue
+                seen[w] = prio
+                state = 0
+                for ch in w:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append([])
+                    state = nxt
+                out[state].append((len(w), prio))
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def match(self, text: str) -> Optional[int]:
+        """Index into `labels` of the winning keyword, or None."""
+        goto, fail, out = self._goto, self._fail, self._out
+        best: Optional[Tuple[int, int, int]] = None  # (start, -len, prio)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, prio in out[state]:
+                cand = (i - length + 1, -length, prio)
+                if best is None or cand < best:
+                    best = cand
+        return None if best is None else best[2]
+
+    def classify(self, origin: str) -> str:
+        idx = self.match((origin or "").lower())
+        return UNKNOWN_REGION if idx is None else self.labels[idx]
+
+
+_REGION_MATCHER = RegionMatcher()
+
+
+@lru_cache(maxsize=4096)
+def origin_to_region(origin: str) -> str:
+    return _REGION_MATCHER.classify(origin)
+
+# ----------------------------
+# Field helpers
+# ----------------------------
+def normalize_text(x: Any, default: str = "Unknown") -> str:
+    if x is None: return default
+    if isinstance(x, str) and x.strip(): return x.strip()
+    return default
+
+def metric_range(x: Any, default: str = "Unknown") -> str:
+    if isinstance(x, dict):
+        m = x.get("metric")
+        if isinstance(m, str) and m.strip(): return m
+    return default
+
+def get_avg_kg(weight_metric: str) -> Optional[float]:
+    try:
+        parts = weight_metric.replace("–","-").split("-")
+        nums = [float(p.strip()) for p in parts if p.strip()]
+        if not nums: return None
+        return sum(nums)/len(nums)
+    except Exception:
+        return None
+
+def size_from_avg(avg: Optional[float]) -> str:
+    if avg is None: return "Unknown"
+    if avg < 10: return "Small"
+    if avg < 25: return "Medium"
+    if avg < 40: return "Large"
+    return "Giant"
+
+def size_category(weight_metric: str) -> str:
+    return size_from_avg(get_avg_kg(weight_metric))
+
+def parse_range(text: str) -> Tuple[float, float, float]:
+    """'25 - 34' -> (lo, hi, avg); NaNs when unparseable (same rules as get_avg_kg)."""
+    try:
+        parts = text.replace("–","-").split("-")
+        nums = [float(p.strip()) for p in parts if p.strip()]
+    except Exception:
+        nums = []
+    if not nums:
+        return math.nan, math.nan, math.nan
+    return min(nums), max(nums), sum(nums)/len(nums)
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+def parse_years(text: str) -> Tuple[float, float]:
+    """'10 - 12 years' -> (10.0, 12.0); NaNs when there is no number."""
+    nums = [float(x) for x in _NUMBER.findall(text or "")]
+    if not nums:
+        return math.nan, math.nan
+    return min(nums), max(nums)
+
+CDN_IMAGE_URL = "https://cdn2.thedogapi.com/images/{}.jpg"
+
+def reference_thumb(b: Mapping[str, Any]) -> str:
+    """Thumbnail URL known from the breed payload alone, or ""."""
+    image = b.get("image")
+    if isinstance(image, dict) and isinstance(image.get("url"), str) and image["url"]:
+        return image["url"]
+    ref = b.get("reference_image_id")
+    if ref:
+        return CDN_IMAGE_URL.format(ref)
+    return ""
+
+# ----------------------------
+# Precomputed breed table
+# ----------------------------
+class BreedTable:
+    """
+    Immutable, column-oriented view of one breed snapshot.
+
+    Built once per snapshot version and shared by every session, so a rerun
+    only indexes into ready-made columns. Categorical columns (region, group,
+    size) are stored as small integer codes into sorted label tuples; numeric
+    ranges are float arrays with NaN for missing values. `records` holds
+    read-only enriched dicts (raw fields + region + size) for display code.
+
+    `thumb_urls` is the one late-bound column: "" means not resolved yet
+    (see thumb_resolver.py); each slot is written at most once.
+    """
+
+    __slots__ = (
+        "version", "records", "ids", "names", "names_lower", "origins",
+        "region_labels", "region_codes", "group_labels", "group_codes",
+        "size_labels", "size_codes",
+        "weight_text", "height_text", "weight_lo", "weight_hi", "weight_avg",
+        "height_lo", "height_hi", "life_lo", "life_hi", "name_to_row", "facets", "thumb_urls",
+    )
+
+    def __init__(self, breeds: Sequence[Dict[str, Any]], version: str = ""):
+        names, names_lower, origins, regions, groups, sizes = [], [], [], [], [], []
+        weight_text, height_text, records, thumbs = [], [], [], []
+        ids = array("q")
+        w_lo, w_hi, w_avg, h_lo, h_hi, l_lo, l_hi = (array("d") for _ in range(7))
+
+        for b in breeds:
+            name = normalize_text(b.get("name"))
+            w = metric_range(b.get("weight"))
+            h = metric_range(b.get("height"))
+            wl, wh, wa = parse_range(w)
+            hl, hh, _ = parse_range(h)
+            ll, lh = parse_years(normalize_text(b.get("life_span"), ""))
+            region = origin_to_region(b.get("origin", ""))
+            size = size_from_avg(None if math.isnan(wa) else wa)
+
+            bid = b.get("id", 0)
+            ids.append(bid if isinstance(bid, int) else 0)
+            names.append(name)
+            names_lower.append(name.lower())
+            origins.append(normalize_text(b.get("origin")))
+            regions.append(region)
+            groups.append(normalize_text(b.get("breed_group"), "Other/Unknown"))
+            sizes.append(size)
+            weight_text.append(w)
+            height_text.append(h)
+            w_lo.append(wl); w_hi.append(wh); w_avg.append(wa)
+            h_lo.append(hl); h_hi.append(hh)
+            l_lo.append(ll); l_hi.append(lh)
+            records.append(MappingProxyType({**b, "region": region, "size": size}))
+            thumbs.append(reference_thumb(b))
+
+        self.version = version
+        self.records: Tuple[Mapping[str, Any], ...] = tuple(records)
+        self.ids = ids
+        self.names: Tuple[str, ...] = tuple(names)
+        self.names_lower: Tuple[str, ...] = tuple(names_lower)
+        self.origins: Tuple[str, ...] = tuple(origins)
+        self.region_labels, self.region_codes = _encode(regions)
+        self.group_labels, self.group_codes = _encode(groups)
+        self.size_labels, self.size_codes = _encode(sizes)
+        self.weight_text: Tuple[str, ...] = tuple(weight_text)
+        self.height_text: Tuple[str, ...] = tuple(height_text)
+        self.weight_lo, self.weight_hi, self.weight_avg = w_lo, w_hi, w_avg
+        self.height_lo, self.height_hi = h_lo, h_hi
+        self.life_lo, self.life_hi = l_lo, l_hi
+        # First occurrence wins, matching the old `next(...)` lookup by name.
+        name_to_row: Dict[str, int] = {}
+        for i, nm in enumerate(names):
+            name_to_row.setdefault(nm, i)
+        self.name_to_row = MappingProxyType(name_to_row)
+        self.facets = FacetIndex(self)
+        self.thumb_urls: List[str] = thumbs
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def region(self, i: int) -> str:
+        return self.region_labels[self.region_codes[i]]
+
+    def group(self, i: int) -> str:
+        return self.group_labels[self.group_codes[i]]
+
+    def size(self, i: int) -> str:
+        return self.size_labels[self.size_codes[i]]
+
+    def rows(self, idx: Sequence[int]) -> List[Mapping[str, Any]]:
+        return [self.records[i] for i in idx]
+
+
+# ----------------------------
+# Facet bitsets
+# ----------------------------
+# Row sets are plain Python ints used as bitsets (bit i <=> table row i):
+# AND/OR/popcount run in C over machine words, even for 50k-row catalogs.
+_BYTE_BITS = tuple(tuple(j for j in range(8) if byte >> j & 1) for byte in range(256))
+
+
+def bits_from_rows(rows: Iterable[int], n: int) -> int:
+    buf = bytearray((n + 7) // 8)
+    for i in rows:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_bits(bits: int) -> List[int]:
+    """Row ids set in `bits`, ascending."""
+    out: List[int] = []
+    if bits <= 0:
+        return out
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for k, byte in enumerate(raw):
+        if byte:
+            base = k * 8
+            out.extend(base + j for j in _BYTE_BITS[byte])
+    return out
+
+
+class FacetIndex:
+    """Inverted index: facet value code -> bitset of rows holding that value."""
+
+    __slots__ = ("all_bits", "region_bits", "group_bits", "size_bits")
+
+    def __init__(self, table: "BreedTable"):
+        n = len(table.records)
+        self.all_bits = (1 << n) - 1
+        self.region_bits = _facet_bits(table.region_codes, len(table.region_labels))
+        self.group_bits = _facet_bits(table.group_codes, len(table.group_labels))
+        self.size_bits = _facet_bits(table.size_codes, len(table.size_labels))
+
+    def value_bits(self, facet: Tuple[int, ...], code: int) -> int:
+        return self.all_bits if code < 0 else facet[code]
+
+    @staticmethod
+    def counts(facet: Tuple[int, ...], mask: int) -> List[int]:
+        return [(b & mask).bit_count() for b in facet]
+
+
+def _facet_bits(codes: array, n_values: int) -> Tuple[int, ...]:
+    rows: List[List[int]] = [[] for _ in range(n_values)]
+    for i, c in enumerate(codes):
+        rows[c].append(i)
+    return tuple(bits_from_rows(r, len(codes)) for r in rows)
+
+
+def _encode(values: List[str]) -> Tuple[Tuple[str, ...], array]:
+    labels = tuple(sorted(set(values)))
+    lookup = {v: k for k, v in enumerate(labels)}
+    return labels, array("H", (lookup[v] for v in values))
+
+# ----------------------------
+# Breed Gallery filtering (keyword + facets)
+# ----------------------------
+class GalleryFilter(NamedTuple):
+    rows: List[int]            # best keyword match first; ascending without a keyword
+    region_counts: List[int]   # per facet value: keyword + the *other* facets' choices applied
+    group_counts: List[int]
+    size_counts: List[int]
+
+
+def filter_rows(table: "BreedTable", ranked: Optional[Sequence[int]],
+                region: int = -1, group: int = -1, size: int = -1,
+                matched_bits: Optional[int] = None) -> GalleryFilter:
+    """
+    Keyword hits (`ranked`, best first; None = no keyword) narrowed to one
+    value code per facet (-1 = All). Every row holds exactly one value per
+    facet, so a facet's "All" count is the sum of its counts.
+
+    When `ranked` is only the head of a longer match list, pass the bitset of
+    every match as `matched_bits`: counts then cover all of them, and matches
+    the facets keep outside the head follow the ranked rows in table order,
+    up to len(ranked).
+    """
+    fx = table.facets
+    kw_bits = fx.all_bits if ranked is None else bits_from_rows(ranked, len(table))
+    hit_bits = kw_bits if matched_bits is None else matched_bits
+    r_bits = fx.value_bits(fx.region_bits, region)
+    g_bits = fx.value_bits(fx.group_bits, group)
+    s_bits = fx.value_bits(fx.size_bits, size)
+    facet_bits = r_bits & g_bits & s_bits
+    if ranked is None:
+        rows = iter_bits(facet_bits)
+    else:
+        allowed = set(iter_bits(kw_bits & facet_bits))
+        rows = [r for r in ranked if r in allowed]
+        if matched_bits is not None and len(rows) < len(ranked):
+            rows += iter_bits(hit_bits & ~kw_bits & facet_bits)[:len(ranked) - len(rows)]
+    return GalleryFilter(
+        rows,
+        fx.counts(fx.region_bits, hit_bits & g_bits & s_bits),
+        fx.counts(fx.group_bits, hit_bits & r_bits & s_bits),
+        fx.counts(fx.size_bits, hit_bits & r_bits & g_bits),
+    )
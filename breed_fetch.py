@@ -0,0 +1,136 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from breed_store import BreedStore, payload_digest
+from fetch_cache import CacheBackend
+from fetch_engine import FetchEngine
+from http_client import UpstreamDecodeError, UpstreamError, get_client
+from swr_cache import SWRCache, Snapshot
+
+# ----------------------------
+# Upstream configuration
+# ----------------------------
+# Offline mode: no upstream calls at all, breeds come purely from the disk snapshot.
+OFFLINE = os.environ.get("DOG_MUSEUM_OFFLINE", "").lower() in ("1", "true", "yes")
+# Upstream roots; overridable to point at local stand-ins (bench/mock_upstream.py).
+DOG_API_BASE = os.environ.get("DOG_API_BASE", "https://api.thedogapi.com").rstrip("/")
+DOG_CEO_BASE = os.environ.get("DOG_CEO_BASE", "https://dog.ceo").rstrip("/")
+
+BREEDS_URL = f"{DOG_API_BASE}/v1/breeds"
+IMAGES_SEARCH_URL = f"{DOG_API_BASE}/v1/images/search"
+BREEDS_TTL_SECONDS = float(os.environ.get("BREEDS_TTL_SECONDS", 6 * 3600))
+IMAGE_LIST_TTL = 3600.0
+
+FALLBACK_BREEDS = [{
+    "id": 0, "name": "Golden Retriever",
+    "bred_for": "Retrieving", "breed_group": "Sporting",
+    "origin": "Scotland", "temperament": "Intelligent, Friendly, Reliable",
+    "life_span": "10 - 12 years",
+    "weight": {"metric": "25 - 34"}, "height": {"metric": "51 - 61"},
+}]
+
+
+def get_json(url: str, params: Optional[dict] = None, timeout: int = 10):
+    """Pooled GET; raises UpstreamError (never returns None) so callers can tell failures apart."""
+    if OFFLINE:
+        raise UpstreamError("offline mode", url)
+    return get_client().get_json(url, params=params, timeout=timeout)
+
+# ----------------------------
+# Breeds (disk snapshot + stale-while-revalidate)
+# ----------------------------
+def load_breeds(store: BreedStore) -> Snapshot:
+    stored = store.load()
+    # Another worker/replica may have refreshed the shared file already.
+    if stored and (OFFLINE or time.time() - stored.fetched_at < BREEDS_TTL_SECONDS):
+        return Snapshot(data=stored.data, fetched_at=stored.fetched_at, version=stored.digest)
+    if OFFLINE:
+        raise UpstreamError("offline mode and no breed snapshot on disk", store.path)
+
+    data = get_client().get_json(BREEDS_URL)
+    if not isinstance(data, list) or not data:
+        raise UpstreamError("empty or malformed breed list", BREEDS_URL)
+    try:
+        saved = store.save(data)
+    except OSError:
+        # Read-only disk: keep serving from memory.
+        return Snapshot(data=data, fetched_at=time.time(), version=payload_digest(data))
+    return Snapshot(data=data, fetched_at=saved.fetched_at, version=saved.digest)
+
+
+def breeds_swr(store: BreedStore) -> SWRCache:
+    # One holder per process, booted from the disk snapshot when present.
+    # The fallback is served but never stored as real data.
+    stored = store.load()
+    initial = (Snapshot(data=stored.data, fetched_at=stored.fetched_at, version=stored.digest)
+               if stored else None)
+    return SWRCache(
+        lambda: load_breeds(store),
+        ttl=float("inf") if OFFLINE else BREEDS_TTL_SECONDS,
+        fallback=FALLBACK_BREEDS,
+        initial=initial,
+        name="breeds",
+    )
+
+# ----------------------------
+# Image URL lists
+# ----------------------------
+def load_breed_images(breed_id: int, limit: int) -> List[str]:
+    data = get_json(IMAGES_SEARCH_URL, params={"breed_id": breed_id, "limit": limit})
+    if not isinstance(data, list):
+        raise UpstreamDecodeError("expected a list", IMAGES_SEARCH_URL)
+    return [d.get("url") for d in data if isinstance(d, dict) and d.get("url")]
+
+
+def load_random_images(limit: int) -> List[str]:
+    url = f"{DOG_CEO_BASE}/api/breeds/image/random/{limit}"
+    data = get_json(url)
+    if isinstance(data, dict) and data.get("status") == "success":
+        imgs = data.get("message")
+        if isinstance(imgs, list):
+            return imgs
+    raise UpstreamDecodeError("unexpected dog.ceo payload", url)
+
+
+def breed_images_key(breed_id: int, limit: int) -> tuple:
+    return ("breed_images", breed_id, limit)
+
+
+def random_images_key(limit: int) -> tuple:
+    return ("random_images", limit)
+
+
+def breed_images_cached(cache: CacheBackend, breed_id: int, limit: int = 12) -> List[str]:
+    return cache.get_or_load(breed_images_key(breed_id, limit),
+                             lambda: load_breed_images(breed_id, limit),
+                             ttl=IMAGE_LIST_TTL, fallback=[])
+
+
+def random_images_cached(cache: CacheBackend, limit: int = 8) -> List[str]:
+    return cache.get_or_load(random_images_key(limit),
+                             lambda: load_random_images(limit),
+                             ttl=IMAGE_LIST_TTL, fallback=[])
+
+
+def exhibition_images(engine: FetchEngine, cache: CacheBackend, breed_id: int,
+                      limit: int = 12, deadline: float = 6.0) -> List[str]:
+    """
+    Breed photos, falling back to random dog photos. Cache hits are answered
+    on the calling thread; only the lists actually missing go to the engine,
+    together (the fallback is cached for an hour), so a miss costs one round
+    trip instead of two, and never more than `deadline`.
+    """
+    hit, breed = cache.peek(breed_images_key(breed_id, limit))
+    if hit and breed:
+        return breed
+    got: Dict[str, Any] = {}
+    jobs = {}
+    if not hit:
+        jobs["breed"] = lambda: breed_images_cached(cache, breed_id, limit)
+    hit, got["random"] = cache.peek(random_images_key(limit))
+    if not hit:
+        jobs["random"] = lambda: random_images_cached(cache, limit)
+    if jobs:
+        got.update(engine.gather(jobs, deadline=deadline))
+    return got.get("breed") or got.get("random") or []
@@ -0,0 +1,219 @@
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from breed_data import BreedTable, normalize_text
+
+# Field weights: a name hit outranks a temperament/bred_for hit.
+FIELD_WEIGHTS = (
+    ("name", 3.0),
+    ("alt_names", 2.5),
+    ("origin", 1.0),
+    ("temperament", 1.0),
+    ("bred_for", 0.8),
+)
+MIN_SCORE = 0.25   # idf-weighted share of query trigrams matched, in name-hit units
+NAME_SUBSTRING_BONUS = 1.0
+# A trigram in more than this share of the catalog (and at least this many
+# rows) is "common": it never selects candidates on its own.
+COMMON_GRAM_SHARE = 0.02
+COMMON_GRAM_MIN_ROWS = 256
+# Ranked matches the gallery asks for (the picker and wall); facet counts
+# come from the full match set.
+SEARCH_RESULTS = 500
+
+T = TypeVar("T")
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_NO_ROWS = np.zeros(0, dtype=np.int32)
+
+
+def trigrams(text: str) -> List[str]:
+    """Padded character trigrams per word: 'lab' -> ['  l', ' la', 'lab', 'ab ']."""
+    grams: List[str] = []
+    for word in _NON_WORD.split(text.lower()):
+        if word:
+            w = f"  {word} "
+            grams.extend(w[i:i + 3] for i in range(len(w) - 2))
+    return grams
+
+
+class BreedSearch:
+    """
+    Trigram index over name, alt names, origin, temperament and bred_for.
+
+    Postings are flat numpy arrays (rows ascending per trigram, with the
+    summed field weight x idf of each row), so scoring a query is one
+    np.bincount over its trigrams' concatenated postings. Trigrams found in
+    more than COMMON_GRAM_SHARE of the catalog only add to rows already
+    matched by rarer ones, which keeps broad queries cheap on large
+    catalogs. Results are ranked by idf-weighted overlap, which tolerates
+    typos and transpositions ("chihuahau" -> Chihuahua).
+    """
+
+    def __init__(self, table: BreedTable, cache_size: int = 512):
+        self.table = table
+        self.n = len(table)
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        name_rows: Dict[str, List[int]] = defaultdict(list)
+        for row, rec in enumerate(table.records):
+            for field, weight in FIELD_WEIGHTS:
+                value = normalize_text(rec.get(field), "")
+                if not value:
+                    continue
+                for g in set(trigrams(value)):
+                    p = postings[g]
+                    p[row] = p.get(row, 0.0) + weight
+            for g in set(trigrams(table.names_lower[row])):
+                name_rows[g].append(row)
+        # Name-only rows per trigram: narrows the name-substring check.
+        self._name_rows: Dict[str, np.ndarray] = {g: np.array(r, dtype=np.int32) for g, r in name_rows.items()}
+
+        self._gram_ids: Dict[str, int] = {g: i for i, g in enumerate(postings)}
+        sizes = np.fromiter((len(p) for p in postings.values()), dtype=np.int64, count=len(postings))
+        self._offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self._offsets[1:])
+        self._idf = np.log1p(self.n / np.maximum(sizes, 1))
+        self._post_rows = np.empty(int(self._offsets[-1]), dtype=np.int32)
+        self._post_scores = np.empty(int(self._offsets[-1]), dtype=np.float64)
+        for i, p in enumerate(postings.values()):
+            lo, hi = self._offsets[i], self._offsets[i + 1]
+            self._post_rows[lo:hi] = list(p.keys())  # ascending: rows were added in order
+            self._post_scores[lo:hi] = list(p.values())
+            self._post_scores[lo:hi] *= self._idf[i]
+        self._common_rows = max(COMMON_GRAM_MIN_ROWS, int(self.n * COMMON_GRAM_SHARE))
+
+        # (q, k or 0) -> search() result; (q, -1) -> match_bits() result
+        self._cache: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _postings(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self._offsets[i], self._offsets[i + 1]
+        return self._post_rows[lo:hi], self._post_scores[lo:hi]
+
+    def _name_maybe(self, q: str) -> Optional[np.ndarray]:
+        """
+        Rows whose names have every inner trigram of q's words, a superset of
+        the names containing q (None when q has no word of 3+ characters).
+        """
+        inner = {w[i:i + 3] for w in _NON_WORD.split(q) for i in range(len(w) - 2)}
+        if not inner:
+            return None
+        if not all(g in self._name_rows for g in inner):
+            return np.zeros(self.n, dtype=bool)
+        return np.bincount(np.concatenate([self._name_rows[g] for g in inner]), minlength=self.n) == len(inner)
+
+    @staticmethod
+    def _best(cand: np.ndarray, score: np.ndarray, k: Optional[int]) -> np.ndarray:
+        """Positions of the top-k scores, best first, ties by row."""
+        if k and len(score) > k:
+            # Keep everything tied with the k-th score, so row order settles ties exactly.
+            kth = np.partition(score, len(score) - k)[len(score) - k]
+            pos = np.flatnonzero(score >= kth)
+        else:
+            pos = np.arange(len(score))
+        return pos[np.lexsort((cand[pos], -score[pos]))][:k or None]
+
+    def _cached(self, key: Tuple[str, int], compute: Callable[[], T]) -> T:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _score(self, q: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Candidate rows, their trigram scores and which may contain q in their
+        name (None when no query trigram is indexed).
+        """
+        grams = set(trigrams(q))
+        ids = [self._gram_ids[g] for g in grams if g in self._gram_ids]
+        if not ids:
+            return None
+        # Unknown trigrams still count in the denominator (they are typos or
+        # noise), using the maximum idf.
+        unseen_idf = math.log(1.0 + self.n)
+        norm = (float(self._idf[ids].sum()) + (len(grams) - len(ids)) * unseen_idf) * FIELD_WEIGHTS[0][1] or 1.0
+
+        sizes = self._offsets[1:][ids] - self._offsets[ids]
+        rare = [i for i, size in zip(ids, sizes) if size <= self._common_rows]
+        parts = [self._postings(i) for i in ids]
+        acc = np.bincount(np.concatenate([r for r, _ in parts]),
+                          weights=np.concatenate([w for _, w in parts]), minlength=self.n)
+        if len(rare) == len(ids):
+            cand = np.flatnonzero(acc)
+        elif rare:
+            # Common trigrams add to rows matched by a rarer one, but never select rows themselves.
+            cand = np.flatnonzero(np.bincount(np.concatenate([self._postings(i)[0] for i in rare]),
+                                              minlength=self.n))
+        else:
+            # Only common trigrams: the rarest of them picks the candidates.
+            cand = self._postings(ids[int(np.argmin(sizes))])[0]
+        maybe = self._name_maybe(q)
+        maybe = np.ones(len(cand), dtype=bool) if maybe is None else maybe[cand]
+        return cand, acc[cand] / norm, maybe
+
+    def search(self, query: str, k: Optional[int] = 50) -> List[Tuple[int, float]]:
+        """Top-k (row, score) pairs, best first (k=None: all matches). Empty query -> []."""
+        q = query.strip().lower()
+        if not q:
+            return []
+
+        def compute() -> List[Tuple[int, float]]:
+            scored = self._score(q)
+            if scored is None:
+                return []
+            cand, score, maybe = scored
+            # Name-substring bonus: a possible hit counts as one, and is
+            # string-tested only once it makes the top k.
+            names = self.table.names_lower
+            tested = np.zeros(len(cand), dtype=bool)
+            while True:
+                total = score + NAME_SUBSTRING_BONUS * maybe
+                ok = np.flatnonzero(total >= MIN_SCORE)
+                top = ok[self._best(cand[ok], total[ok], k)]
+                todo = top[maybe[top] & ~tested[top]]
+                if not len(todo):
+                    break
+                tested[todo] = True
+                maybe[todo] = [q in names[r] for r in cand[todo].tolist()]
+            return list(zip(cand[top].tolist(), total[top].tolist()))
+
+        return self._cached((q, k or 0), compute)
+
+    def match_bits(self, query: str) -> int:
+        """
+        Every row search() would return with k=None, as an int bitset (bit i =
+        row i; 0 for an empty query). Cheaper than ranking them all when only
+        the set is needed, as for the gallery's facet counts.
+        """
+        q = query.strip().lower()
+        if not q:
+            return 0
+
+        def compute() -> int:
+            scored = self._score(q)
+            if scored is None:
+                return 0
+            cand, score, maybe = scored
+            hit = score >= MIN_SCORE
+            # Only name candidates the bonus would lift over MIN_SCORE need the string test.
+            todo = np.flatnonzero(maybe & ~hit & (score + NAME_SUBSTRING_BONUS >= MIN_SCORE))
+            names = self.table.names_lower
+            hit[todo] = [q in names[r] for r in cand[todo].tolist()]
+            rows = np.zeros(self.n, dtype=bool)
+            rows[cand[hit]] = True
+            return int.from_bytes(np.packbits(rows, bitorder="little").tobytes(), "little")
+
+        return self._cached((q, -1), compute)
@@ -0,0 +1,149 @@
+import math
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from breed_data import BreedTable, normalize_text
+
+# ----------------------------
+# "Visitors also admire": k nearest breeds
+# ----------------------------
+# Each breed is a row of one feature matrix: z-scored size and life span,
+# one-hot group and department, idf-weighted temperament tokens. Blocks are
+# weighted, rows are L2-normalized, and similarity is the dot product.
+NEIGHBORS_K = 12
+MAX_TEMPERAMENT_TOKENS = 128
+BLOCK_WEIGHTS = {"numeric": 1.0, "group": 0.8, "region": 0.5, "temperament": 1.2}
+UNKNOWN_LABELS = frozenset(("Other/Unknown", "Unknown / Global", "Unknown"))
+BLOCK_BYTES = 32 * 1024 * 1024  # similarity block per matrix product while precomputing
+
+
+def temperament_tokens(text: str) -> List[str]:
+    return [t.strip().lower() for t in (text or "").split(",") if t.strip()]
+
+
+def _zscore(col: np.ndarray) -> np.ndarray:
+    ok = ~np.isnan(col)
+    if not ok.any():
+        return np.zeros_like(col)
+    mu, sd = col[ok].mean(), col[ok].std()
+    out = (col - mu) / (sd or 1.0)
+    out[~ok] = 0.0  # missing -> catalog mean
+    return out
+
+
+def _one_hot(codes, labels: Tuple[str, ...]) -> np.ndarray:
+    keep = [i for i, lab in enumerate(labels) if lab not in UNKNOWN_LABELS]
+    m = np.zeros((len(codes), len(keep)), dtype=np.float32)
+    col = {c: j for j, c in enumerate(keep)}
+    rows = [(r, col[c]) for r, c in enumerate(codes) if c in col]
+    if rows:
+        r, c = zip(*rows)
+        m[list(r), list(c)] = 1.0
+    return m
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+def feature_matrix(table: BreedTable) -> np.ndarray:
+    """(n_breeds, n_features) float32, unit rows."""
+    n = len(table)
+    numeric = np.column_stack([
+        _zscore(np.log1p(np.asarray(table.weight_lo, dtype=np.float64))),
+        _zscore(np.log1p(np.asarray(table.weight_hi, dtype=np.float64))),
+        _zscore(np.asarray(table.height_lo, dtype=np.float64)),
+        _zscore(np.asarray(table.height_hi, dtype=np.float64)),
+        _zscore(np.asarray(table.life_lo, dtype=np.float64)),
+        _zscore(np.asarray(table.life_hi, dtype=np.float64)),
+    ]) if n else np.zeros((0, 6))
+    numeric /= math.sqrt(numeric.shape[1])
+
+    tokens = [set(temperament_tokens(normalize_text(b.get("temperament"), ""))) for b in table.records]
+    df = Counter(t for ts in tokens for t in ts)
+    vocab = [t for t, c in df.most_common(MAX_TEMPERAMENT_TOKENS) if c > 1]
+    col = {t: j for j, t in enumerate(vocab)}
+    temper = np.zeros((n, len(vocab)), dtype=np.float32)
+    for r, ts in enumerate(tokens):
+        for t in ts:
+            j = col.get(t)
+            if j is not None:
+                temper[r, j] = math.log(n / df[t])
+
+    blocks = [
+        BLOCK_WEIGHTS["numeric"] * numeric.astype(np.float32),
+        BLOCK_WEIGHTS["group"] * _one_hot(table.group_codes, table.group_labels),
+        BLOCK_WEIGHTS["region"] * _one_hot(table.region_codes, table.region_labels),
+        BLOCK_WEIGHTS["temperament"] * _unit_rows(temper),
+    ]
+    return np.ascontiguousarray(_unit_rows(np.hstack(blocks)), dtype=np.float32)
+
+
+class BreedNeighbors:
+    """
+    Top-k similar breeds for every row of one snapshot.
+
+    Neighbor lists are filled block by block (one matrix product per
+    BLOCK_BYTES of similarities, so peak memory does not grow with the
+    catalog), in the background once `start()` is called. A row asked for before its block is done is computed on the spot
+    with a single matrix-vector product and kept.
+    """
+
+    def __init__(self, table: BreedTable, k: int = NEIGHBORS_K):
+        self.table = table
+        self.k = max(0, min(k, len(table) - 1))
+        self.features = feature_matrix(table)
+        n = len(table)
+        self._ids = np.zeros((n, self.k), dtype=np.int32)
+        self._scores = np.zeros((n, self.k), dtype=np.float32)
+        self._ready = np.zeros(n, dtype=bool)
+        self.done = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _top(self, rows: np.ndarray, sims: np.ndarray):
+        """Fill neighbor lists for `rows` from their (len(rows), n) similarity block."""
+        k = self.k
+        np.negative(sims, out=sims)  # ascending order = most similar first
+        sims[np.arange(len(rows)), rows] = np.inf  # never recommend the breed itself
+        for i, row in enumerate(rows):  # one row at a time: no block-sized index array
+            part = np.argpartition(sims[i], k - 1)[:k]
+            top = sims[i, part]
+            order = np.argsort(top, kind="stable")
+            self._ids[row] = part[order]
+            self._scores[row] = -top[order]
+        self._ready[rows] = True
+
+    def build(self):
+        n = len(self.table)
+        if self.k:
+            step = max(1, BLOCK_BYTES // (n * self.features.itemsize))
+            for lo in range(0, n, step):
+                rows = np.arange(lo, min(lo + step, n))
+                todo = rows[~self._ready[rows]]
+                if len(todo):
+                    self._top(todo, self.features[todo] @ self.features.T)
+        self.done.set()
+
+    def start(self) -> "BreedNeighbors":
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+        threading.Thread(target=self.build, name="breed-neighbors", daemon=True).start()
+        return self
+
+    def similar(self, row: int, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(row, cosine similarity) of the k most similar breeds, best first."""
+        k = self.k if k is None else min(k, self.k)
+        if not k:
+            return []
+        if not self._ready[row]:
+            rows = np.array([row])
+            self._top(rows, self.features[rows] @ self.features.T)
+        return [(int(i), float(s)) for i, s in zip(self._ids[row, :k], self._scores[row, :k])]
@@ -0,0 +1,38 @@
+import os
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from breed_data import BreedTable
+from breed_fetch import breeds_swr
+from breed_store import BreedStore
+from swr_cache import SWRCache, Snapshot
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ----------------------------
+# Breeds (shared per process by every wing, see breed_fetch.py)
+# ----------------------------
+SNAPSHOT_PATH = os.environ.get(
+    "BREEDS_SNAPSHOT_PATH",
+    os.path.join(APP_DIR, ".cache", "breeds.snapshot"),
+)
+
+@st.cache_resource(show_spinner=False)
+def breed_store() -> BreedStore:
+    return BreedStore(SNAPSHOT_PATH)
+
+@st.cache_resource(show_spinner=False)
+def breeds_cache() -> SWRCache:
+    return breeds_swr(breed_store())
+
+def breeds_snapshot() -> Snapshot:
+    return breeds_cache().get()
+
+def fetch_breeds() -> List[Dict[str, Any]]:
+    return breeds_snapshot().data
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_breed_table(version: str, _breeds: List[Dict[str, Any]]) -> BreedTable:
+    # Keyed by snapshot version only; the list itself is never hashed or copied.
+    return BreedTable(_breeds, version)
@@ -0,0 +1,125 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from breed_data import BreedTable, normalize_text
+
+# ----------------------------
+# Catalog statistics over prepared columns
+# ----------------------------
+# Everything here works on the float/code columns BreedTable already parsed
+# once per snapshot, so a summary is a handful of numpy passes instead of
+# re-parsing weight/height/life-span strings per breed.
+METRICS = ("Weight (kg)", "Height (cm)", "Life span (years)")
+GROUP_BY = ("Department", "Breed Group", "Size")
+MAX_COMPARE = 10
+
+
+def rows_mask(bits: int, n: int) -> np.ndarray:
+    """Facet bitset (bit i <=> row i) -> boolean row mask."""
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].astype(bool)
+
+
+class BreedStats:
+    """Numeric and categorical columns of one snapshot as numpy arrays."""
+
+    def __init__(self, table: BreedTable):
+        self.table = table
+        f = lambda a: np.asarray(a, dtype=np.float64)
+        self.values: Dict[str, np.ndarray] = {
+            "Weight (kg)": f(table.weight_avg),
+            "Height (cm)": (f(table.height_lo) + f(table.height_hi)) / 2,
+            "Life span (years)": (f(table.life_lo) + f(table.life_hi)) / 2,
+        }
+        self.codes: Dict[str, Tuple[np.ndarray, Tuple[str, ...]]] = {
+            "Department": (np.asarray(table.region_codes, dtype=np.intp), table.region_labels),
+            "Breed Group": (np.asarray(table.group_codes, dtype=np.intp), table.group_labels),
+            "Size": (np.asarray(table.size_codes, dtype=np.intp), table.size_labels),
+        }
+        # Sorted known values per metric, for catalog percentile ranks.
+        self._sorted = {m: np.sort(v[~np.isnan(v)]) for m, v in self.values.items()}
+
+    def mask(self, regions: Sequence[int] = (), groups: Sequence[int] = (), sizes: Sequence[int] = ()) -> np.ndarray:
+        """Rows matching any selected value of every facet (an empty selection matches all)."""
+        fx = self.table.facets
+        bits = fx.all_bits
+        for facet, codes in ((fx.region_bits, regions), (fx.group_bits, groups), (fx.size_bits, sizes)):
+            if codes:
+                sel = 0
+                for c in codes:
+                    sel |= facet[c]
+                bits &= sel
+        return rows_mask(bits, len(self.table))
+
+    def summary(self, metric: str, by: str, mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Per value of `by`: breeds, breeds with data, mean, min, quartiles and
+        max of `metric`. Rows are sorted by group code then value once, so
+        every statistic is one vectorized op over all groups.
+        """
+        values = self.values[metric]
+        codes, labels = self.codes[by]
+        sel = np.ones(len(values), dtype=bool) if mask is None else mask
+        ok = sel & ~np.isnan(values)
+        v, c = values[ok], codes[ok]
+        order = np.lexsort((v, c))
+        v, c = v[order], c[order]
+
+        g = np.arange(len(labels))
+        starts = np.searchsorted(c, g, "left")
+        count = np.searchsorted(c, g, "right") - starts
+        breeds = np.bincount(codes[sel], minlength=len(labels))
+        means = np.bincount(c, weights=v, minlength=len(labels)) / np.maximum(count, 1)
+
+        def quantile(q: float) -> np.ndarray:
+            pos = starts + q * np.maximum(count - 1, 0)
+            lo = np.minimum(np.floor(pos).astype(np.intp), max(len(v) - 1, 0))
+            hi = np.minimum(np.ceil(pos).astype(np.intp), max(len(v) - 1, 0))
+            if not len(v):
+                return np.full(len(labels), np.nan)
+            return v[lo] + (v[hi] - v[lo]) * (pos - np.floor(pos))
+
+        q = {k: quantile(p) for k, p in (("min", 0.0), ("p25", 0.25), ("median", 0.5), ("p75", 0.75), ("max", 1.0))}
+        out = []
+        for i in np.flatnonzero(breeds):
+            has = count[i] > 0
+            out.append({
+                by: labels[i], "breeds": int(breeds[i]), "with data": int(count[i]),
+                **{k: round(float(q[k][i]), 1) if has else None for k in ("min", "p25", "median", "p75", "max")},
+                "mean": round(float(means[i]), 1) if has else None,
+            })
+        return out
+
+    def percentile_rank(self, metric: str, rows: Sequence[int]) -> np.ndarray:
+        """Share of the catalog (with data) at or below each row's value, 0-100; NaN when unknown."""
+        ref = self._sorted[metric]
+        v = self.values[metric][np.asarray(rows, dtype=np.intp)]
+        ranks = np.searchsorted(ref, v, "right") * (100.0 / max(len(ref), 1))
+        return np.where(np.isnan(v), np.nan, ranks)
+
+    def comparison(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        """One record per breed for a side-by-side table (at most MAX_COMPARE)."""
+        rows = list(rows)[:MAX_COMPARE]
+        t = self.table
+        pct = {m: self.percentile_rank(m, rows) for m in METRICS}
+        out = []
+        for k, r in enumerate(rows):
+            rec = {
+                "Breed": t.names[r], "Department": t.region(r), "Breed Group": t.group(r), "Size": t.size(r),
+                "Weight (kg)": t.weight_text[r], "Height (cm)": t.height_text[r],
+                "Life span": normalize_text(t.records[r].get("life_span")),
+            }
+            for m in METRICS:
+                p = pct[m][k]
+                rec[f"{m.split(' (')[0]} percentile"] = None if np.isnan(p) else int(round(p))
+            out.append(rec)
+        return out
+
+    def chart_data(self, rows: Sequence[int]) -> Dict[str, List[Any]]:
+        """Breed name + each metric's value, column-oriented (st.bar_chart input)."""
+        idx = np.asarray(list(rows)[:MAX_COMPARE], dtype=np.intp)
+        data: Dict[str, List[Any]] = {"Breed": [self.table.names[r] for r in idx]}
+        for m in METRICS:
+            data[m] = [None if np.isnan(x) else round(float(x), 1) for x in self.values[m][idx]]
+        return data
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+# ----------------------------
+# On-disk breed snapshot
+# ----------------------------
+# Layout: fixed header followed by zlib-compressed canonical JSON.
+#   magic(8) | format(u16) | fetched_at(f64) | sha256(32) | raw_len(u64) | payload
+MAGIC = b"DOGSNAP\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHd32sQ")
+
+
+def canonical_json(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def payload_digest(data: Any) -> str:
+    return hashlib.sha256(canonical_json(data)).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredSnapshot:
+    data: List[dict]
+    fetched_at: float
+    digest: str
+
+
+class BreedStore:
+    """
+    Versioned snapshot of the /v1/breeds payload, shared by every process
+    that points at the same path. Writes are atomic (temp file + rename),
+    so readers never see a half-written file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[StoredSnapshot]:
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < _HEADER.size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    magic, fmt, fetched_at, digest, raw_len = _HEADER.unpack_from(mm, 0)
+                    if magic != MAGIC or fmt != FORMAT_VERSION:
+                        return None
+                    raw = zlib.decompress(mm[_HEADER.size:])
+        except (OSError, ValueError, zlib.error, struct.error):
+            return None
+
+        if len(raw) != raw_len or hashlib.sha256(raw).digest() != digest:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        if not isinstance(data, list):
+            return None
+        return StoredSnapshot(data=data, fetched_at=fetched_at, digest=digest.hex())
+
+    def save(self, data: List[dict], fetched_at: Optional[float] = None) -> StoredSnapshot:
+        raw = canonical_json(data)
+        digest = hashlib.sha256(raw).digest()
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        blob = _HEADER.pack(MAGIC, FORMAT_VERSION, fetched_at, digest, len(raw)) + zlib.compress(raw, 6)
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".breeds-", dir=folder)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return StoredSnapshot(data=data, fetched_at=fetched_at, digest=digest.hex())
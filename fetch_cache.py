@@ -0,0 +1,246 @@
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple, TypeVar
+
+import metrics
+from http_client import UpstreamError
+from singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage for fetch results (image URL lists) with per-entry TTL.
+
+    Subclasses implement get/set/__len__; the read-through logic lives here:
+    failures are cached only briefly (`fallback_ttl`) and concurrent misses
+    for one key are coalesced into a single load.
+
+    Metric: fetch_cache_requests_total{cache, fn, result=hit|miss|fallback},
+    where fn is the fetch function a key belongs to (its first element,
+    e.g. "breed_images").
+    """
+
+    def __init__(self, max_entries: int, name: str):
+        self.max_entries = max_entries
+        self.name = name
+        self._flight = SingleFlight(name)
+
+    @abc.abstractmethod
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """(True, value) for a live entry, else (False, None)."""
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Store `value` for `ttl` seconds, evicting as needed."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key)[0]
+
+    @staticmethod
+    def _fn(key: Hashable) -> str:
+        return str(key[0]) if isinstance(key, tuple) and key else str(key)
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """get() that counts a hit; a miss is left for the get_or_load that follows."""
+        hit, value = self.get(key)
+        if hit:
+            metrics.inc("fetch_cache_requests_total", cache=self.name, fn=self._fn(key), result="hit")
+        return hit, value
+
+    def free_slots(self) -> int:
+        """Slots a new entry can take without evicting a live one (expired entries count as free)."""
+        return max(0, self.max_entries - len(self))
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T], ttl: float,
+                    fallback: T, fallback_ttl: float = 60.0) -> T:
+        fn = self._fn(key)
+        hit, value = self.get(key)
+        if hit:
+            metrics.inc("fetch_cache_requests_total", cache=self.name, fn=fn, result="hit")
+            return value
+        metrics.inc("fetch_cache_requests_total", cache=self.name, fn=fn, result="miss")
+
+        def load() -> T:
+            hit, value = self.get(key)  # filled while we queued for the flight
+            if hit:
+                return value
+            try:
+                value = loader()
+            except UpstreamError:
+                metrics.inc("fetch_cache_requests_total", cache=self.name, fn=fn, result="fallback")
+                self.set(key, fallback, fallback_ttl)
+                return fallback
+            self.set(key, value, ttl)
+            return value
+
+        return self._flight.do(key, load)
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process LRU. Unlike st.cache_data it can be warmed from background threads."""
+
+    def __init__(self, max_entries: int = 512, name: str = "cache"):
+        super().__init__(max_entries, name)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            if item[0] < time.time():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def free_slots(self) -> int:
+        with self._lock:
+            now = time.time()
+            for key in [k for k, (expires, _) in self._data.items() if expires < now]:
+                del self._data[key]
+            return max(0, self.max_entries - len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Host-wide cache in one SQLite file (WAL mode), shared by every app
+    process pointing at the same path. Values must be JSON-serialisable.
+
+    Eviction drops expired rows first, then least recently used ones, to stay
+    within `max_entries` and `max_bytes` for this cache's namespace. Access
+    times are refreshed at most once a minute so reads rarely write.
+    """
+
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path: str, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024,
+                 name: str = "cache"):
+        super().__init__(max_entries, name)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS kv (
+                    ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+                    expires REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL,
+                    PRIMARY KEY (ns, key)
+                )""")
+            db.execute("CREATE INDEX IF NOT EXISTS kv_lru ON kv (ns, accessed)")
+
+    def _conn(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _k(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key, separators=(",", ":"))
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        k = self._k(key)
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires, accessed FROM kv WHERE ns=? AND key=?", (self.name, k)
+            ).fetchone()
+        except sqlite3.Error:
+            return False, None
+        if row is None:
+            return False, None
+        value, expires, accessed = row
+        now = time.time()
+        if expires < now:
+            return False, None
+        if now - accessed > self.TOUCH_INTERVAL:
+            try:
+                self._conn().execute("UPDATE kv SET accessed=? WHERE ns=? AND key=?", (now, self.name, k))
+            except sqlite3.Error:
+                pass  # e.g. locked past the busy timeout: the LRU clock just lags, the hit stands
+        return True, json.loads(value)
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        blob = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        try:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO kv (ns, key, value, expires, accessed, size) VALUES (?,?,?,?,?,?)",
+                (self.name, self._k(key), blob, now + ttl, now, len(blob)),
+            )
+            self._evict(db, now)
+        except sqlite3.Error:
+            pass  # a busy/locked shared cache must never break a render
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        count, size = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM kv WHERE ns=?", (self.name,)
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        db.execute("DELETE FROM kv WHERE ns=? AND expires<?", (self.name, now))
+        while True:
+            count, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM kv WHERE ns=?", (self.name,)
+            ).fetchone()
+            if count == 0 or (count <= self.max_entries and size <= self.max_bytes):
+                return
+            excess = max(count - self.max_entries, count // 10, 1)
+            db.execute(
+                "DELETE FROM kv WHERE rowid IN "
+                "(SELECT rowid FROM kv WHERE ns=? ORDER BY accessed LIMIT ?)",
+                (self.name, excess),
+            )
+
+    def free_slots(self) -> int:
+        try:
+            live = self._conn().execute(
+                "SELECT COUNT(*) FROM kv WHERE ns=? AND expires>=?", (self.name, time.time())
+            ).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+        return max(0, self.max_entries - live)
+
+    def __len__(self) -> int:
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM kv WHERE ns=?", (self.name,)).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+def open_cache(backend: str, name: str, path: str, max_entries: int = 512,
+               max_bytes: int = 16 * 1024 * 1024) -> CacheBackend:
+    """'sqlite' (shared by all workers on the host) or 'memory' (per process)."""
+    if backend == "sqlite":
+        try:
+            return SQLiteCache(path, max_entries=max_entries, max_bytes=max_bytes, name=name)
+        except (OSError, sqlite3.Error):
+            pass  # e.g. read-only disk: fall back to a per-process cache
+    return MemoryCache(max_entries=max_entries, name=name)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import metrics
+
+
+class FetchEngine:
+    """
+    asyncio engine for independent fetches, with a synchronous façade for
+    the Streamlit script thread.
+
+    The event loop lives in its own daemon thread for the whole process. Each
+    job is a blocking callable (it goes through the pooled HttpClient and the
+    fetch caches) run on a bounded executor, so all jobs of a page start at
+    once and page latency is the slowest job, capped by `deadline`.
+    Jobs still running at the deadline are not cancelled: they finish in the
+    background and land in the caches for the next rerun. At most
+    `max_pending` jobs (queued or running) are outstanding at once; while an
+    upstream is slow, further jobs are shed instead of piling up behind the
+    late ones.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_pending: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending if max_pending is not None else 2 * max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="fetch-engine")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="fetch-engine-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def _gather(self, jobs: Mapping[str, Callable[[], Any]], deadline: float) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        tasks = {}
+        for name, fn in jobs.items():
+            if self._admit():
+                tasks[name] = loop.run_in_executor(self._executor, self._run, fn)
+            else:
+                metrics.inc("fetch_engine_jobs_shed_total", job=name)
+        if not tasks:
+            return {}
+        await asyncio.wait(tasks.values(), timeout=deadline)
+        out: Dict[str, Any] = {}
+        for name, task in tasks.items():
+            if not task.done():
+                metrics.inc("fetch_engine_deadline_missed_total", job=name)
+            elif task.exception() is None:
+                out[name] = task.result()
+            else:
+                metrics.inc("fetch_engine_job_errors_total", job=name)
+        return out
+
+    def gather(self, jobs: Mapping[str, Callable[[], Any]], deadline: float = 6.0) -> Dict[str, Any]:
+        """
+        Run `jobs` concurrently and return {name: result} for those that
+        finished within `deadline` seconds without raising. Jobs shed because
+        too many are outstanding are missing from the result, like late ones.
+        """
+        fut = asyncio.run_coroutine_threadsafe(self._gather(jobs, deadline), self._ensure_loop())
+        return fut.result()
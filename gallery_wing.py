@@ -0,0 +1,353 @@
+import os
+import random
+from typing import Any, List, Tuple
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+import metrics
+from breed_data import BreedTable, filter_rows, normalize_text
+from breed_fetch import OFFLINE, breed_images_cached, breed_images_key, exhibition_images
+from breed_search import SEARCH_RESULTS, BreedSearch
+from breed_similar import BreedNeighbors
+from breed_source import APP_DIR, breeds_snapshot, get_breed_table
+from fetch_cache import CacheBackend, open_cache
+from fetch_engine import FetchEngine
+from image_cache import ImageCache
+from prefetch import Prefetcher
+from rendering import WALL_PAGE_SIZE, ExhibitPanel, exhibit_panel, wall_html
+from swr_cache import format_age
+from thumb_resolver import ThumbResolver
+
+# ----------------------------
+# Breed search (breed data itself: see breed_source.py)
+# ----------------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_breed_search(version: str, _table: BreedTable) -> BreedSearch:
+    # Built lazily on the first search of a snapshot, then shared.
+    return BreedSearch(_table)
+
+# ----------------------------
+# Image URL lists (shared cache, warmable from background threads)
+# ----------------------------
+# "sqlite": one cache file shared by every app process on the host; "memory": per process.
+FETCH_CACHE_BACKEND = os.environ.get("FETCH_CACHE_BACKEND", "sqlite")
+FETCH_CACHE_PATH = os.environ.get("FETCH_CACHE_PATH", os.path.join(APP_DIR, ".cache", "fetch-cache.sqlite3"))
+
+@st.cache_resource(show_spinner=False)
+def image_list_cache() -> CacheBackend:
+    return open_cache(FETCH_CACHE_BACKEND, "image_lists", FETCH_CACHE_PATH,
+                      max_entries=2048, max_bytes=16 * 1024 * 1024)
+
+# ----------------------------
+# Concurrent page fetches (see fetch_engine.py)
+# ----------------------------
+PAGE_FETCH_DEADLINE = float(os.environ.get("PAGE_FETCH_DEADLINE", 6.0))
+
+@st.cache_resource(show_spinner=False)
+def fetch_engine() -> FetchEngine:
+    return FetchEngine(max_concurrency=8)
+
+def fetch_exhibition_images(breed_id: int, limit: int = 12) -> List[str]:
+    # Cache resolved here: the engine's jobs run off the script thread.
+    return exhibition_images(fetch_engine(), image_list_cache(), breed_id, limit, PAGE_FETCH_DEADLINE)
+
+# ----------------------------
+# Predictive prefetch (see prefetch.py)
+# ----------------------------
+PREFETCH_NEIGHBORS = 2   # breeds on each side of the current pick
+PREFETCH_TOP_RESULTS = 6  # head of the current filter results
+
+@st.cache_resource(show_spinner=False)
+def prefetcher() -> Prefetcher:
+    return Prefetcher(image_list_cache(), max_workers=3, max_pending=16)
+
+def prefetch_exhibitions(table: BreedTable, rows: List[int], current_pos: int, limit: int = 12):
+    """Warm breed_images_cached for neighbours of the current pick, then the top results."""
+    order = []
+    for d in range(1, PREFETCH_NEIGHBORS + 1):
+        order += [current_pos + d, current_pos - d]
+    hint = [rows[j] for j in order if 0 <= j < len(rows)] + rows[:PREFETCH_TOP_RESULTS]
+    cache = image_list_cache()
+    jobs, seen = [], set()
+    for r in hint:
+        bid = table.ids[r]
+        if bid in seen:
+            continue
+        seen.add(bid)
+        jobs.append((breed_images_key(bid, limit),
+                     lambda bid=bid: breed_images_cached(cache, bid, limit)))
+    prefetcher().prefetch(jobs)
+
+# ----------------------------
+# Image proxy (downscaled thumbnails, see image_cache.py)
+# ----------------------------
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(APP_DIR, ".cache", "images"))
+# Browsers load thumbnails from app/static/thumbs, so a THUMB_DIR elsewhere
+# only suits headless runs (bench.load) unless it is served under that path.
+THUMB_DIR = os.environ.get("THUMB_DIR", os.path.join(APP_DIR, "static", "thumbs"))
+CARD_THUMB_W = 480     # card wall column
+HERO_THUMB_W = 960     # exhibition lead photo
+GALLERY_THUMB_W = 360  # exhibition grid (3 columns)
+PLACEHOLDER_THUMB = "app/static/placeholder.png"  # bundled, served by static serving
+
+@st.cache_resource(show_spinner=False)
+def image_cache() -> ImageCache:
+    return ImageCache(
+        orig_dir=IMAGE_CACHE_DIR,
+        thumb_dir=THUMB_DIR,
+        public_prefix="app/static/thumbs",
+        max_bytes=IMAGE_CACHE_MAX_BYTES,
+        fetch=not OFFLINE,
+    )
+
+def sized_image(url: str, width: int) -> str:
+    """Local thumbnail path for st.image when cached, else the upstream URL."""
+    return image_cache().local_or_schedule(url, width) or url
+
+# ----------------------------
+# Card Wall (stable order, paginated, memoized HTML)
+# ----------------------------
+WALL_SEEDS = 16  # a handful of orderings, shared by all sessions
+
+@st.cache_resource(show_spinner=False, max_entries=2 * WALL_SEEDS)
+def wall_rank(version: str, seed: int, n: int) -> Tuple[int, ...]:
+    """Position of each table row in the seeded wall order."""
+    perm = list(range(n))
+    random.Random(f"{version}:{seed}").shuffle(perm)
+    rank = [0] * n
+    for pos, row in enumerate(perm):
+        rank[row] = pos
+    return tuple(rank)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def thumb_resolver(version: str, _table: BreedTable) -> ThumbResolver:
+    # One bulk, concurrent pass per snapshot for breeds without an image.
+    # Few workers, so foreground requests keep free per-host slots.
+    resolver = ThumbResolver(_table, image_list_cache(), fetch=not OFFLINE)
+    resolver.start()
+    return resolver
+
+def breed_thumb(table: BreedTable, row: int) -> str:
+    return table.thumb_urls[row] or PLACEHOLDER_THUMB
+
+def wall_srcs(table: BreedTable, page_rows: Tuple[int, ...]) -> Tuple[str, ...]:
+    cache = image_cache()
+    urls = [breed_thumb(table, r) for r in page_rows]
+    thumbs = [cache.thumb_url(u, CARD_THUMB_W) for u in urls]
+    # Switch the page to thumbnails only once all of them are settled, so the
+    # wall iframe re-renders at most once per page instead of per image.
+    if all(cache.settled(u, CARD_THUMB_W) for u in urls):
+        return tuple(thumbs)
+    return tuple(urls)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def wall_page_html(version: str, page_rows: Tuple[int, ...], srcs: Tuple[str, ...],
+                   _table: BreedTable) -> str:
+    # Identical HTML across reruns lets the frontend keep the iframe as is.
+    return wall_html(_table, page_rows, srcs)
+
+# ----------------------------
+# Exhibition text, per breed and snapshot version
+# ----------------------------
+# LRU-bounded: popular breeds stay warm; a new snapshot version simply misses
+# and the old entries age out.
+EXHIBIT_CACHE_ENTRIES = int(os.environ.get("EXHIBIT_CACHE_ENTRIES", 1024))
+
+@st.cache_resource(show_spinner=False, max_entries=EXHIBIT_CACHE_ENTRIES)
+def exhibit_content(version: str, breed_id: Any, row: int, _table: BreedTable) -> ExhibitPanel:
+    return exhibit_panel(_table, row)
+
+# ----------------------------
+# "Visitors also admire" (see breed_similar.py)
+# ----------------------------
+ADMIRE_COUNT = 6
+PLACEHOLDER_PATH = os.path.join(APP_DIR, "static", "placeholder.png")
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def breed_neighbors(version: str, _table: BreedTable) -> BreedNeighbors:
+    # Feature matrix once per snapshot; neighbor lists fill in the background.
+    return BreedNeighbors(_table).start()
+
+def admired_rows(table: BreedTable, row: int, rows: List[int]) -> List[int]:
+    """Most similar breeds that are also in the current filter set."""
+    similar = [r for r, _ in breed_neighbors(table.version, table).similar(row)]
+    if len(rows) < len(table):
+        allowed = set(rows)
+        similar = [r for r in similar if r in allowed]
+    return similar[:ADMIRE_COUNT]
+
+def pick_breed(name: str):
+    # A fresh selectbox key makes the picker open on `name`, even when the
+    # same breed was picked before and the visitor has since moved on.
+    st.session_state["picked_name"] = name
+    st.session_state["pick_seq"] = st.session_state.get("pick_seq", 0) + 1
+
+# ----------------------------
+# Fragments (partial reruns)
+# ----------------------------
+# Each reruns alone on its own widgets, with the inputs of the last full run:
+# picking a breed or turning a wall page leaves the rest of the page alone.
+# Sidebar filters live outside them and rerun the whole wing.
+@st.fragment
+def exhibition(table: BreedTable, rows: List[int]):
+    with metrics.fragment_run("exhibition"):
+        names_list = [table.names[i] for i in rows]
+        picked_name = st.session_state.get("picked_name")
+        default_index = names_list.index(picked_name) if picked_name in names_list else 0
+
+        selected_name = st.selectbox("🎨 Select a breed to open its exhibition", names_list, index=default_index,
+                                     key=f"exhibit_pick_{st.session_state.get('pick_seq', 0)}")
+        row = table.name_to_row.get(selected_name, rows[0])
+        current = table.records[row]
+        panel = exhibit_content(table.version, current.get("id", 0), row, table)
+
+        images = fetch_exhibition_images(current.get("id", 0), limit=12)
+        prefetch_exhibitions(table, rows, names_list.index(selected_name) if selected_name in names_list else 0)
+        metrics.lap("exhibition_fetch")
+
+        left, right = st.columns([1.05, 1.7], gap="large")
+        with left:
+            st.markdown('<div class="glass">', unsafe_allow_html=True)
+            if images:
+                st.image(sized_image(images[0], HERO_THUMB_W), use_container_width=True,
+                         caption=panel.name)
+            else:
+                st.info("Exhibition photos are unavailable right now.")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            st.markdown('<div class="glass"><h3>🖼️ Exhibition Gallery</h3></div>', unsafe_allow_html=True)
+            cols = st.columns(3)
+            for i, url in enumerate(images[1:12]):
+                with cols[i % 3]:
+                    st.image(sized_image(url, GALLERY_THUMB_W), use_container_width=True)
+
+        with right:
+            st.markdown('<div class="glass">', unsafe_allow_html=True)
+            st.subheader(f"✨ {panel.name}")
+
+            st.markdown("### 📌 Basic Information")
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Origin", panel.origin)
+            c2.metric("Department", panel.region)
+            c3.metric("Breed Group", panel.group)
+            c4.metric("Life Span", panel.life_span)
+
+            st.markdown("### 📏 Appearance")
+            a1, a2, a3 = st.columns(3)
+            a1.write(f"**Height (cm):** {panel.height}")
+            a2.write(f"**Weight (kg):** {panel.weight}")
+            a3.write(f"**Size Category:** {panel.size}")
+
+            st.markdown(panel.details_md)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        admired = admired_rows(table, row, rows)
+        if admired:
+            st.markdown("### 💞 Visitors also admire")
+            for col, r in zip(st.columns(ADMIRE_COUNT), admired):
+                with col:
+                    url = table.thumb_urls[r]
+                    st.image(sized_image(url, GALLERY_THUMB_W) if url else PLACEHOLDER_PATH,
+                             use_container_width=True)
+                    st.button(table.names[r], key=f"admire_{r}", on_click=pick_breed, args=(table.names[r],),
+                              use_container_width=True)
+        metrics.lap("exhibition_render")
+
+
+@st.fragment
+def card_wall(table: BreedTable, rows: List[int], filter_key: Tuple[Any, ...]):
+    with metrics.fragment_run("card_wall"):
+        st.markdown("### 🧱 Global Breed Card Wall")
+        seed = st.session_state.setdefault("wall_seed", random.randrange(WALL_SEEDS))
+        rank = wall_rank(table.version, seed, len(table))
+        wall_rows = sorted(rows, key=rank.__getitem__)
+        n_pages = max(1, -(-len(wall_rows) // WALL_PAGE_SIZE))
+
+        # Back to page 1 whenever the filter set changes.
+        if st.session_state.get("wall_filter") != filter_key:
+            st.session_state["wall_filter"] = filter_key
+            st.session_state["wall_page"] = 1
+        page = min(max(1, st.session_state.get("wall_page", 1)), n_pages)
+        st.session_state["wall_page"] = page
+
+        def _turn(delta: int):
+            st.session_state["wall_page"] = st.session_state.get("wall_page", 1) + delta
+
+        def _reshuffle():
+            st.session_state["wall_seed"] = (st.session_state.get("wall_seed", 0) + 1) % WALL_SEEDS
+            st.session_state["wall_page"] = 1
+
+        p1, p2, p3, p4 = st.columns([1, 1, 3, 1.2])
+        p1.button("◀ Prev", on_click=_turn, args=(-1,), disabled=page <= 1, key="wall_prev")
+        p2.button("Next ▶", on_click=_turn, args=(1,), disabled=page >= n_pages, key="wall_next")
+        p3.caption(f"Page {page} of {n_pages} · {len(wall_rows)} breeds")
+        p4.button("🔀 Reshuffle", on_click=_reshuffle, key="wall_shuffle")
+
+        page_rows = tuple(wall_rows[(page - 1) * WALL_PAGE_SIZE: page * WALL_PAGE_SIZE])
+        components.html(wall_page_html(table.version, page_rows, wall_srcs(table, page_rows), table),
+                        height=1200, scrolling=True)
+        metrics.lap("card_wall")
+
+# ----------------------------
+# Wing A: Breed Gallery
+# ----------------------------
+def render():
+    snapshot = breeds_snapshot()
+    table = get_breed_table(snapshot.version, snapshot.data)
+    thumb_resolver(table.version, table)
+    if snapshot.is_fallback:
+        st.sidebar.caption("⚠️ Breed data: offline sample (upstream unavailable, retrying)")
+    elif OFFLINE:
+        st.sidebar.caption(f"Offline mode · breed snapshot from {format_age(snapshot.age())}")
+    else:
+        st.sidebar.caption(f"Breed data refreshed {format_age(snapshot.age())}")
+    metrics.lap("data_prep")
+
+    st.markdown(
+        '<div class="glass"><h2>🐶 Breed Gallery Wing</h2>'
+        '<p style="opacity:0.9">Explore nearly all dog breeds worldwide with curator narratives and exhibitions.</p></div>',
+        unsafe_allow_html=True
+    )
+
+    st.sidebar.header("Gallery Settings")
+    keyword = st.sidebar.text_input("Search breed", "", placeholder="name, origin, temperament…")
+    ranked = matched_bits = None
+    if keyword.strip():
+        search = get_breed_search(table.version, table)
+        ranked = [r for r, _ in search.search(keyword, k=SEARCH_RESULTS)]
+        matched_bits = search.match_bits(keyword)  # facet counts cover every match, not just the ranked head
+
+    # Counts are shown next to each facet value, so filter with the current
+    # choices before the selectboxes are drawn.
+    def _code(labels, key):
+        v = st.session_state.get(key, "All")
+        return labels.index(v) if v in labels else -1
+    found = filter_rows(table, ranked, _code(table.region_labels, "f_region"),
+                        _code(table.group_labels, "f_group"), _code(table.size_labels, "f_size"), matched_bits)
+
+    def _facet_select(label, labels, counts, key):
+        by_label, total = dict(zip(labels, counts)), sum(counts)
+        return st.sidebar.selectbox(
+            label, ["All"] + list(labels), key=key,
+            format_func=lambda v: f"{v} ({total if v == 'All' else by_label.get(v, 0)})",
+        )
+
+    _facet_select("Department", table.region_labels, found.region_counts, "f_region")
+    _facet_select("Breed Group", table.group_labels, found.group_counts, "f_group")
+    _facet_select("Size", table.size_labels, found.size_counts, "f_size")
+
+    rows = found.rows
+    if not rows:
+        st.warning("No breeds found with current filters. Showing all breeds instead.")
+        rows = list(range(len(table)))
+    metrics.lap("gallery_filter")
+
+    if st.sidebar.button("🎲 Curator Pick"):
+        pick_breed(normalize_text(table.names[random.choice(rows)]))
+
+    exhibition(table, rows)
+    filter_key = (table.version, keyword, st.session_state.get("f_region"),
+                  st.session_state.get("f_group"), st.session_state.get("f_size"))
+    card_wall(table, rows, filter_key)
@@ -0,0 +1,167 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# ----------------------------
+# Error types
+# ----------------------------
+class UpstreamError(Exception):
+    """Base error for any failed upstream call (TheDogAPI / dog.ceo)."""
+
+    def __init__(self, message: str, url: str = ""):
+        super().__init__(message)
+        self.url = url
+
+
+class UpstreamTimeout(UpstreamError):
+    pass
+
+
+class UpstreamConnectionError(UpstreamError):
+    pass
+
+
+class UpstreamHTTPError(UpstreamError):
+    def __init__(self, message: str, url: str = "", status: int = 0):
+        super().__init__(message, url)
+        self.status = status
+
+
+class UpstreamDecodeError(UpstreamError):
+    pass
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ----------------------------
+# Pooled, retrying client
+# ----------------------------
+class HttpClient:
+    """
+    Keep-alive session shared by all fetch functions.
+    Retries transient failures with capped, jittered backoff and limits
+    concurrent requests per host.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        max_retries: int = 3,
+        backoff: float = 0.3,
+        backoff_cap: float = 4.0,
+        per_host_limit: int = 6,
+        timeout: float = 10,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._slots.get(host)
+            if sem is None:
+                sem = self._slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return sem
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff * (2 ** attempt)))
+
+    def _get(self, url: str, params: Optional[dict], timeout: Optional[float], **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc
+        slot = self._slot(host)
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            with slot:
+                t0 = time.perf_counter()
+                try:
+                    r = self.session.get(url, params=params, timeout=timeout, **kwargs)
+                except requests.Timeout as e:
+                    metrics.observe("upstream_request_seconds", time.perf_counter() - t0, host=host, outcome="timeout")
+                    err: UpstreamError = UpstreamTimeout(str(e), url)
+                except requests.ConnectionError as e:
+                    metrics.observe("upstream_request_seconds", time.perf_counter() - t0, host=host, outcome="connection")
+                    err = UpstreamConnectionError(str(e), url)
+                except requests.RequestException as e:
+                    raise UpstreamError(str(e), url) from e
+                else:
+                    metrics.observe("upstream_request_seconds", time.perf_counter() - t0,
+                                    host=host, outcome=str(r.status_code))
+                    if r.status_code in RETRY_STATUSES:
+                        err = UpstreamHTTPError(f"HTTP {r.status_code}", url, r.status_code)
+                        retry_after = r.headers.get("Retry-After")
+                        r.close()
+                    elif r.status_code >= 400:
+                        r.close()
+                        raise UpstreamHTTPError(f"HTTP {r.status_code}", url, r.status_code)
+                    else:
+                        return r
+
+            if attempt == self.max_retries:
+                raise err
+            metrics.inc("upstream_retries_total", host=host)
+            time.sleep(self._delay(attempt, retry_after))
+
+        raise UpstreamError("retries exhausted", url)
+
+    def get_json(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        r = self._get(url, params, timeout)
+        try:
+            return r.json()
+        except ValueError as e:
+            raise UpstreamDecodeError(str(e), url) from e
+
+    def get_bytes(self, url: str, max_bytes: int = 20 * 1024 * 1024, timeout: Optional[float] = None) -> bytes:
+        """Download a binary body (images), refusing anything over `max_bytes`."""
+        r = self._get(url, None, timeout, stream=True, headers={"Accept": "image/*"})
+        try:
+            buf = bytearray()
+            for chunk in r.iter_content(64 * 1024):
+                buf += chunk
+                if len(buf) > max_bytes:
+                    raise UpstreamDecodeError(f"body larger than {max_bytes} bytes", url)
+            return bytes(buf)
+        except requests.RequestException as e:
+            raise UpstreamConnectionError(str(e), url) from e
+        finally:
+            r.close()
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide client, shared across Streamlit sessions."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,259 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from http_client import UpstreamError, get_client
+from image_limits import MAX_SOURCE_PIXELS
+
+# ----------------------------
+# Image proxy + thumbnail cache
+# ----------------------------
+# Upstream images are downloaded once into <orig_dir>/<sha1(url)> and
+# downscaled per slot width into <thumb_dir>/<sha1(url)>_<w>.<ext>.
+# thumb_dir lives under ./static, which Streamlit serves (static serving on)
+# at  app/static/thumbs/...  so browsers fetch and cache small files.
+THUMB_FORMAT = "WEBP"
+THUMB_EXT = "webp"
+THUMB_QUALITY = 78
+FAILURE_TTL = 600.0  # seconds before a failed URL is tried again
+# Budget enforcement works from disk, which every app process shares:
+SCAN_INTERVAL = 60.0  # re-scan at least this often while writing
+TOUCH_INTERVAL = 60.0  # a cache hit refreshes the file's mtime (LRU clock) at most this often
+EVICT_TO = 0.9  # evict down to this share of max_bytes, so a full cache is not re-scanned per write
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def make_thumbnail(raw: bytes, width: int) -> bytes:
+    with Image.open(io.BytesIO(raw)) as im:
+        if im.width * im.height > MAX_SOURCE_PIXELS:
+            raise ValueError("image too large")
+        im.draft("RGB", (width, width * 4))  # cheap JPEG DCT downscale
+        im = im.convert("RGB")
+        if im.width > width:
+            im.thumbnail((width, width * 4), Image.LANCZOS)
+        out = io.BytesIO()
+        im.save(out, THUMB_FORMAT, quality=THUMB_QUALITY, method=4)
+        return out.getvalue()
+
+
+class ImageCache:
+    """
+    Disk-backed, byte-budgeted LRU of upstream originals and their thumbnails.
+
+    - The directories are shared by every app process, so the budget is
+      enforced from disk state: the files are re-scanned every SCAN_INTERVAL
+      while writing (sooner if this process's own writes would overflow the
+      last scan) and the least recently used ones, by mtime, are deleted.
+    - Concurrent requests for the same (url, width) share one Future, so an
+      image is never fetched or resized twice at the same time.
+    - `thumb_url` never blocks: if the thumbnail is not on disk yet it
+      schedules the work and returns the upstream URL for this render.
+    """
+
+    def __init__(self, orig_dir: str, thumb_dir: str, public_prefix: str,
+                 max_bytes: int = 256 * 1024 * 1024, workers: int = 6, fetch: bool = True,
+                 fetcher: Optional[Callable[[str], bytes]] = None):
+        self.public_prefix = public_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.fetch = fetch
+        self.fetcher = fetcher or (lambda url: get_client().get_bytes(url))
+        self.orig_dir = orig_dir
+        self.thumb_dir = thumb_dir
+        os.makedirs(self.orig_dir, exist_ok=True)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._bytes = 0  # on disk at the last scan + written by this process since
+        self._files = 0
+        self._scanned_at = 0.0
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+        self._failed: Dict[str, float] = {}
+        # Striped locks: two widths of one URL never download the original twice.
+        self._orig_locks = tuple(threading.Lock() for _ in range(32))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="img-cache")
+        self._enforce()
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        entries = []
+        for d in (self.orig_dir, self.thumb_dir):
+            try:
+                it = os.scandir(d)
+            except OSError:
+                continue
+            with it:
+                for e in it:
+                    if e.name.startswith("."):
+                        continue
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, e.path, st.st_size))
+        return entries
+
+    def _enforce(self):
+        """Re-scan both directories; over budget, delete least recently used files."""
+        if not self._scan_lock.acquire(blocking=False):
+            return  # another thread of this process is on it
+        try:
+            entries = sorted(self._scan())
+            total, files = sum(size for _, _, size in entries), len(entries)
+            if total > self.max_bytes:
+                for _, path, size in entries:
+                    if total <= self.max_bytes * EVICT_TO:
+                        break
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass  # evicted by another process
+                    except OSError:
+                        continue
+                    total -= size
+                    files -= 1
+            with self._lock:
+                self._bytes, self._files, self._scanned_at = total, files, time.time()
+        finally:
+            self._scan_lock.release()
+
+    # ---- paths
+    def _orig_path(self, url: str) -> str:
+        return os.path.join(self.orig_dir, url_key(url))
+
+    def _thumb_name(self, url: str, width: int) -> str:
+        return f"{url_key(url)}_{width}.{THUMB_EXT}"
+
+    def thumb_path(self, url: str, width: int) -> str:
+        return os.path.join(self.thumb_dir, self._thumb_name(url, width))
+
+    # ---- LRU bookkeeping
+    def _touch(self, path: str, mtime: float):
+        if time.time() - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def _add(self, size: int):
+        with self._lock:
+            self._bytes += size
+            self._files += 1
+            due = self._bytes > self.max_bytes or time.time() - self._scanned_at > SCAN_INTERVAL
+        if due:
+            self._enforce()
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(prefix=".img-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._add(len(data))
+
+    # ---- work
+    def _original(self, url: str) -> bytes:
+        p = self._orig_path(url)
+        with self._orig_locks[hash(p) % len(self._orig_locks)]:
+            try:
+                with open(p, "rb") as f:
+                    data = f.read()
+                    self._touch(p, os.fstat(f.fileno()).st_mtime)
+                return data
+            except OSError:
+                pass
+            if not self.fetch:
+                raise UpstreamError("image fetching disabled", url)
+            data = self.fetcher(url)
+            self._write(p, data)
+            return data
+
+    def _build(self, url: str, width: int) -> str:
+        path = self.thumb_path(url, width)
+        if not os.path.exists(path):
+            try:
+                self._write(path, make_thumbnail(self._original(url), width))
+            except Exception:
+                with self._lock:
+                    self._failed[url] = time.time()
+                raise
+        return path
+
+    def _recently_failed(self, url: str) -> bool:
+        with self._lock:
+            t = self._failed.get(url)
+            if t is None:
+                return False
+            if time.time() - t > FAILURE_TTL:
+                del self._failed[url]
+                return False
+            return True
+
+    def ensure(self, url: str, width: int) -> Future:
+        """Future resolving to the local thumbnail path (single-flight per key)."""
+        key = (url, width)
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut
+            fut = self._pool.submit(self._build, url, width)
+            self._inflight[key] = fut
+        fut.add_done_callback(lambda _f: self._forget(key))
+        return fut
+
+    def _forget(self, key: Tuple[str, int]):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def cached_path(self, url: str, width: int) -> Optional[str]:
+        path = self.thumb_path(url, width)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        self._touch(path, mtime)
+        return path
+
+    def settled(self, url: str, width: int) -> bool:
+        """True once the thumbnail exists or the URL recently failed (nothing left to wait for)."""
+        if not url.startswith(("http://", "https://")):
+            return True
+        return self.cached_path(url, width) is not None or self._recently_failed(url)
+
+    def local_or_schedule(self, url: str, width: int) -> Optional[str]:
+        """Thumbnail path if ready; otherwise start building it and return None."""
+        if not url.startswith(("http://", "https://")):
+            return None
+        path = self.cached_path(url, width)
+        if path is None and not self._recently_failed(url):
+            self.ensure(url, width)
+        return path
+
+    def thumb_url(self, url: str, width: int) -> str:
+        """Public thumbnail URL when cached, else the original URL (non-blocking)."""
+        if not url:
+            return url
+        path = self.local_or_schedule(url, width)
+        if path is None:
+            return url
+        return f"{self.public_prefix}/{self._thumb_name(url, width)}"
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"files": self._files, "bytes": self._bytes,
+                    "max_bytes": self.max_bytes, "inflight": len(self._inflight)}
@@ -0,0 +1,6 @@
+# ----------------------------
+# Image decode limits
+# ----------------------------
+# Shared by the thumbnail cache and photo uploads. Kept free of imports so
+# photo_upload does not pull in the HTTP client just to read a constant.
+MAX_SOURCE_PIXELS = 40_000_000  # refuse decompression bombs
@@ -0,0 +1,210 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# ----------------------------
+# Process-wide metrics registry
+# ----------------------------
+# Keys are (metric name, sorted label pairs), e.g.
+#   ("singleflight_coalesced_total", (("flight", "image_lists"),))
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Latency buckets (seconds), Prometheus style upper bounds.
+BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                              0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# One JSON record per rerun (section timings) is appended here when set.
+METRICS_JSONL_PATH = os.environ.get("METRICS_JSONL_PATH", "")
+
+_lock = threading.Lock()
+_counters: Dict[LabelKey, float] = {}
+_histograms: Dict[LabelKey, List[float]] = {}  # per bucket counts + [+Inf, sum]
+
+
+def _key(name: str, labels: Dict[str, str]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1.0, **labels: str):
+    k = _key(name, labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0.0) + value
+
+
+def observe(name: str, value: float, **labels: str):
+    k = _key(name, labels)
+    with _lock:
+        h = _histograms.get(k)
+        if h is None:
+            h = _histograms[k] = [0.0] * (len(BUCKETS) + 2)
+        h[bisect.bisect_left(BUCKETS, value)] += 1
+        h[-1] += value
+
+
+@contextmanager
+def timer(name: str, **labels: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+def counters() -> Dict[LabelKey, float]:
+    with _lock:
+        return dict(_counters)
+
+
+def histograms() -> Dict[LabelKey, List[float]]:
+    with _lock:
+        return {k: list(v) for k, v in _histograms.items()}
+
+
+def quantile(hist: List[float], q: float) -> float:
+    """Bucket-interpolated quantile of a histogram from histograms()."""
+    counts = hist[:-1]
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0.0
+    for i, c in enumerate(counts):
+        if seen + c >= rank and c:
+            lo = BUCKETS[i - 1] if i > 0 else 0.0
+            hi = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+            return lo + (hi - lo) * (rank - seen) / c
+        seen += c
+    return BUCKETS[-1]
+
+# ----------------------------
+# Per-rerun section laps
+# ----------------------------
+# Each Streamlit session reruns the script on its own thread, so the
+# current rerun's laps are thread-local.
+_rerun = threading.local()
+
+
+def begin_rerun(**labels: str):
+    now = time.perf_counter()
+    _rerun.start = now
+    _rerun.last = now
+    _rerun.laps = []
+    _rerun.labels = labels
+
+
+def lap(section: str):
+    """Record the time since the previous lap (or begin_rerun) under `section`."""
+    last = getattr(_rerun, "last", None)
+    if last is None:
+        return
+    now = time.perf_counter()
+    dt = now - last
+    _rerun.last = now
+    _rerun.laps.append((section, dt))
+    observe("rerun_section_seconds", dt, section=section)
+
+
+def end_rerun(**labels: str) -> Optional[Dict[str, object]]:
+    start = getattr(_rerun, "start", None)
+    if start is None:
+        return None
+    total = time.perf_counter() - start
+    labels = {**_rerun.labels, **labels}
+    observe("rerun_seconds", total, **labels)
+    record = {"ts": time.time(), "total_s": round(total, 6), **labels,
+              "sections": {s: round(dt, 6) for s, dt in _rerun.laps}}
+    _rerun.start = None
+    _rerun.last = None
+    _rerun.previous = record
+    return record
+
+
+def last_rerun() -> Optional[Dict[str, object]]:
+    return getattr(_rerun, "previous", None)
+
+
+@contextmanager
+def fragment_run(name: str) -> Iterator[None]:
+    """
+    Wrap a st.fragment body. During a full rerun its laps join that rerun;
+    a fragment-only rerun is recorded as a rerun of its own (fragment=name)
+    and saved to METRICS_JSONL_PATH like a full one.
+    """
+    if getattr(_rerun, "start", None) is not None:
+        yield
+        return
+    begin_rerun(fragment=name)
+    try:
+        yield
+    finally:
+        save_rerun(end_rerun())
+
+# ----------------------------
+# Export
+# ----------------------------
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in pairs) + "}"
+
+
+def prometheus_text() -> str:
+    """All counters and histograms in the Prometheus text exposition format."""
+    lines: List[str] = []
+    typed = set()
+    for (name, labels), v in sorted(counters().items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {v:g}")
+    for (name, labels), h in sorted(histograms().items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cum = 0.0
+        for i, upper in enumerate(BUCKETS):
+            cum += h[i]
+            lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', f'{upper:g}'),))} {cum:g}")
+        cum += h[len(BUCKETS)]
+        lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {cum:g}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {h[-1]:.6f}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {cum:g}")
+    return "\n".join(lines) + "\n"
+
+
+def json_lines() -> str:
+    """One JSON object per metric series (counters, then histograms)."""
+    out = []
+    for (name, labels), v in sorted(counters().items()):
+        out.append(json.dumps({"metric": name, "type": "counter", "labels": dict(labels), "value": v}))
+    for (name, labels), h in sorted(histograms().items()):
+        out.append(json.dumps({
+            "metric": name, "type": "histogram", "labels": dict(labels),
+            "count": sum(h[:-1]), "sum": h[-1],
+            "p50": quantile(h, 0.5), "p99": quantile(h, 0.99),
+        }))
+    return "\n".join(out) + "\n"
+
+
+def append_jsonl(path: str, record: Dict[str, object]):
+    with _lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def save_rerun(record: Optional[Dict[str, object]]):
+    """Append a rerun record to METRICS_JSONL_PATH, if set; write errors are ignored."""
+    if record and METRICS_JSONL_PATH:
+        try:
+            append_jsonl(METRICS_JSONL_PATH, record)
+        except OSError:
+            pass
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+import metrics
+
+# ----------------------------
+# Performance panel (debug only)
+# ----------------------------
+# Imported by app.py only when the panel is enabled (DOG_MUSEUM_DEBUG=1).
+def _series(name: str, by: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for (n, labels), v in metrics.counters().items():
+        if n == name:
+            k = dict(labels).get(by, "")
+            out[k] = out.get(k, 0.0) + v
+    return out
+
+
+def render_perf_panel(record: Optional[Dict[str, Any]]):
+    with st.sidebar.expander("🛠 Performance", expanded=False):
+        if record:
+            st.caption(f"Last rerun: {record['total_s'] * 1000:.1f} ms")
+            st.dataframe(
+                [{"section": k, "ms": round(v * 1000, 2)} for k, v in record["sections"].items()],
+                hide_index=True, use_container_width=True,
+            )
+
+        hists = metrics.histograms()
+        reruns = [h for (n, _), h in hists.items() if n == "rerun_seconds"]
+        if reruns:
+            merged = [sum(col) for col in zip(*reruns)]
+            st.caption(f"Reruns: {int(sum(merged[:-1]))} · p50 {metrics.quantile(merged, 0.5) * 1000:.0f} ms"
+                       f" · p99 {metrics.quantile(merged, 0.99) * 1000:.0f} ms")
+
+        cache_rows = []
+        for (n, labels), v in sorted(metrics.counters().items()):
+            if n in ("fetch_cache_requests_total", "swr_cache_requests_total"):
+                cache_rows.append({**dict(labels), "count": int(v)})
+        if cache_rows:
+            st.markdown("**Fetch caches**")
+            st.dataframe(cache_rows, hide_index=True, use_container_width=True)
+
+        up_rows = []
+        for (n, labels), h in sorted(hists.items()):
+            if n == "upstream_request_seconds":
+                up_rows.append({**dict(labels), "count": int(sum(h[:-1])),
+                                "p50 ms": round(metrics.quantile(h, 0.5) * 1000, 1),
+                                "p99 ms": round(metrics.quantile(h, 0.99) * 1000, 1)})
+        if up_rows:
+            st.markdown("**Upstream**")
+            st.dataframe(up_rows, hide_index=True, use_container_width=True)
+            retries = _series("upstream_retries_total", "host")
+            if retries:
+                st.caption("Retries: " + ", ".join(f"{h} {int(v)}" for h, v in retries.items()))
+
+        leaders = _series("singleflight_leader_total", "flight")
+        joined = _series("singleflight_coalesced_total", "flight")
+        if leaders or joined:
+            st.markdown("**Single-flight**")
+            st.caption(" · ".join(f"{f}: {int(leaders.get(f, 0))} ran, {int(joined.get(f, 0))} coalesced"
+                                  for f in sorted(set(leaders) | set(joined))))
+
+        d1, d2 = st.columns(2)
+        d1.download_button("Prometheus", metrics.prometheus_text(), "metrics.prom", "text/plain")
+        d2.download_button("JSON lines", metrics.json_lines(), "metrics.jsonl", "application/json")
@@ -0,0 +1,125 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, FrozenSet, NamedTuple, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+import metrics
+from image_limits import MAX_SOURCE_PIXELS  # same decompression-bomb guard as the thumbnail cache
+
+# ----------------------------
+# Symptom photo uploads
+# ----------------------------
+# Uploads are hashed in chunks, decoded once under size limits and kept only
+# as a bounded preview in a process-wide LRU keyed by content hash. Sessions
+# hold just the hash, so a 12 MP phone photo costs the same as a small one
+# after the first rerun, and re-uploading the same file decodes nothing.
+MAX_UPLOAD_MB = int(os.environ.get("PHOTO_MAX_UPLOAD_MB", 25))  # keep in sync with server.maxUploadSize
+PREVIEW_EDGE = 768
+PREVIEW_QUALITY = 82
+HASH_CHUNK = 256 * 1024
+
+
+class UploadError(ValueError):
+    """The upload is too large, not an image, or cannot be decoded."""
+
+
+class Preview(NamedTuple):
+    digest: str
+    data: bytes       # JPEG, longest edge <= PREVIEW_EDGE
+    width: int
+    height: int
+    source_size: Tuple[int, int]
+    source_bytes: int
+
+
+def content_hash(f: BinaryIO, max_bytes: int) -> Tuple[str, int]:
+    """sha256 of a file-like object read in chunks; refuses anything over max_bytes."""
+    h = hashlib.sha256()
+    size = 0
+    f.seek(0)
+    while True:
+        chunk = f.read(HASH_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadError(f"photo is larger than {max_bytes // (1024 * 1024)} MB")
+        h.update(chunk)
+    f.seek(0)
+    return h.hexdigest(), size
+
+
+def make_preview(f: BinaryIO, digest: str, size: int, edge: int = PREVIEW_EDGE) -> Preview:
+    try:
+        with Image.open(f) as im:
+            if im.width * im.height > MAX_SOURCE_PIXELS:
+                raise UploadError("photo resolution is too large")
+            source_size = im.size
+            im.draft("RGB", (edge, edge))  # JPEG: decode at 1/2..1/8 scale directly
+            im = ImageOps.exif_transpose(im).convert("RGB")
+            im.thumbnail((edge, edge), Image.LANCZOS)
+            out = io.BytesIO()
+            im.save(out, "JPEG", quality=PREVIEW_QUALITY, optimize=True)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise UploadError(f"could not read photo ({e.__class__.__name__})") from e
+    return Preview(digest, out.getvalue(), im.width, im.height, source_size, size)
+
+
+class PhotoUploads:
+    """
+    Byte-budgeted LRU of upload previews plus a small LRU of analysis results
+    keyed by (content hash, photo type, signs).
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_results: int = 2048,
+                 max_upload_bytes: int = MAX_UPLOAD_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_results = max_results
+        self.max_upload_bytes = max_upload_bytes
+        self._lock = threading.Lock()
+        self._previews: "OrderedDict[str, Preview]" = OrderedDict()
+        self._bytes = 0
+        self._results: "OrderedDict[Tuple[str, str, FrozenSet[str]], Any]" = OrderedDict()
+
+    def get(self, digest: str):
+        with self._lock:
+            p = self._previews.get(digest)
+            if p is not None:
+                self._previews.move_to_end(digest)
+            return p
+
+    def ingest(self, f: BinaryIO) -> Preview:
+        """Preview for an uploaded file; decodes only content not seen before."""
+        digest, size = content_hash(f, self.max_upload_bytes)
+        p = self.get(digest)
+        if p is not None:
+            metrics.inc("photo_upload_total", result="hit")
+            return p
+        metrics.inc("photo_upload_total", result="decode")
+        with metrics.timer("photo_preview_seconds"):
+            p = make_preview(f, digest, size)
+        with self._lock:
+            if digest not in self._previews:
+                self._previews[digest] = p
+                self._bytes += len(p.data)
+                while self._bytes > self.max_bytes and len(self._previews) > 1:
+                    _, old = self._previews.popitem(last=False)
+                    self._bytes -= len(old.data)
+        return p
+
+    def analysis(self, digest: str, photo_type: str, signs, compute: Callable[[], Any]) -> Any:
+        key = (digest, photo_type, frozenset(signs))
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result
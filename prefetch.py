@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, Set, Tuple
+
+from fetch_cache import CacheBackend
+
+
+class Prefetcher:
+    """
+    Warms a fetch cache in the background for keys the visitor is likely to
+    open next.
+
+    - At most `max_workers` fetches run at once and at most `max_pending`
+      wait in the queue; extra hints are dropped, not queued.
+    - Speculative work never evicts real entries: a batch is trimmed to the
+      cache's free slots (expired entries count as free), minus `reserve`
+      kept for foreground requests.
+    """
+
+    def __init__(self, cache: CacheBackend, max_workers: int = 3, max_pending: int = 16,
+                 reserve: int = 32):
+        self.cache = cache
+        self.max_pending = max_pending
+        self.reserve = reserve
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+
+    def prefetch(self, jobs: Iterable[Tuple[Hashable, Callable[[], object]]]) -> int:
+        """Queue (cache_key, warm_fn) pairs; returns how many were queued."""
+        queued = 0
+        room = self.cache.free_slots() - self.reserve
+        for key, fn in jobs:
+            if room <= 0:
+                break
+            if key in self.cache:
+                continue
+            with self._lock:
+                if key in self._pending or len(self._pending) >= self.max_pending:
+                    continue
+                self._pending.add(key)
+            self._pool.submit(self._run, key, fn)
+            room -= 1
+            queued += 1
+        self.submitted += queued
+        return queued
+
+    def _run(self, key: Hashable, fn: Callable[[], object]):
+        try:
+            fn()
+        except Exception:
+            pass  # best effort; the foreground path will retry
+        finally:
+            with self._lock:
+                self._pending.discard(key)
@@ -0,0 +1,135 @@
+from typing import NamedTuple, Sequence
+
+from breed_data import BreedTable, normalize_text
+
+# ----------------------------
+# Card wall HTML
+# ----------------------------
+WALL_PAGE_SIZE = 24  # cards per card-wall page
+
+# Card wall lives in its own iframe (components.html), so it carries its own styles.
+WALL_CSS = """
+<style>
+body{ margin:0; color:#e5e7eb; font-family:"Source Sans Pro",sans-serif; background:transparent; }
+/* Masonry */
+.masonry{ column-count:4; column-gap:14px; }
+@media (max-width: 1400px){ .masonry{ column-count:3; } }
+@media (max-width: 1000px){ .masonry{ column-count:2; } }
+@media (max-width: 640px){ .masonry{ column-count:1; } }
+
+.card{
+  break-inside:avoid;
+  background: rgba(255,255,255,0.045);
+  border:1px solid rgba(255,255,255,0.09);
+  border-radius:16px; overflow:hidden; margin:0 0 14px 0;
+  box-shadow:0 10px 28px rgba(0,0,0,0.55);
+  transform: translateY(0);
+  transition: transform .18s ease, box-shadow .18s ease, border-color .18s ease;
+  animation: fadeUp .35s ease;
+}
+.card:hover{
+  transform: translateY(-4px);
+  border-color: rgba(234,179,8,0.45);
+  box-shadow:0 16px 40px rgba(0,0,0,0.7);
+}
+.card img{ width:100%; height:auto; display:block; }
+.card-body{ padding:10px 12px 12px 12px; }
+.card-title{ font-weight:800; font-size:16px; color:#f9fafb; margin-bottom:4px; }
+.card-meta{ font-size:12px; opacity:0.8; margin-bottom:6px; }
+.card-tags span{
+  display:inline-block;font-size:11px;padding:4px 7px;border-radius:999px;
+  background:rgba(255,255,255,0.06);
+  border:1px solid rgba(255,255,255,0.08);
+  margin-right:5px;
+}
+@keyframes fadeUp{
+  from{opacity:0;transform: translateY(8px);}
+  to{opacity:1;transform: translateY(0);}
+}
+</style>
+"""
+
+def wall_html(table: BreedTable, page_rows: Sequence[int], srcs: Sequence[str]) -> str:
+    """Self-contained HTML for one card-wall page (rows of `table`, image srcs in the same order)."""
+    out = [WALL_CSS, '<div class="masonry">']
+    for r, src in zip(page_rows, srcs):
+        b = table.records[r]
+        out.append(f"""
+        <div class="card">
+            <img src="{src}" loading="lazy"/>
+            <div class="card-body">
+                <div class="card-title">{table.names[r]}</div>
+                <div class="card-meta">{table.region(r)} · {table.group(r)}</div>
+                <div class="card-tags">
+                  <span>{table.size(r)}</span>
+                  <span>{normalize_text(b.get("origin"),"Unknown")}</span>
+                </div>
+            </div>
+        </div>
+        """)
+    out.append("</div>")
+    return "\n".join(out)
+
+# ----------------------------
+# Curator narrative
+# ----------------------------
+_NARRATIVE = """
+**{name}** is presented here as a living cultural artifact—its physique and temperament echo centuries of selective breeding.
+
+### 🧭 Department / Geographic Lineage
+- **Origin:** {origin}
+- **Museum Department:** **{region}**
+
+### 🏛️ Historical Context
+Bred for **{bred_for}**, classified as **{group}**.
+Behavior and structure reflect this purpose.
+
+### 🎭 Temperament
+**{temperament}**
+
+### 🧬 Physical Form
+- Size: **{size}**
+- Height: **{height} cm**
+- Weight: **{weight} kg**
+
+### 🩺 Care Notes
+Life span: **{life_span}**. Routine exercise + mental enrichment recommended.
+
+### 💡 Curator Highlight
+A breed shaped by **function → companionship**, preserved like a masterpiece.
+""".strip()
+
+# ----------------------------
+# Exhibition panel
+# ----------------------------
+class ExhibitPanel(NamedTuple):
+    """Everything the exhibition panel shows for one breed except its photos."""
+    name: str
+    origin: str
+    region: str
+    group: str
+    life_span: str
+    height: str
+    weight: str
+    size: str
+    details_md: str  # temperament, role and curator narrative, one markdown block
+
+
+def exhibit_panel(table: BreedTable, row: int) -> ExhibitPanel:
+    """Built from the table's prepared columns; only the free-text fields are read from the record."""
+    b = table.records[row]
+    name, origin, region, group = table.names[row], table.origins[row], table.region(row), table.group(row)
+    weight, height, size = table.weight_text[row], table.height_text[row], table.size(row)
+    life_span = normalize_text(b.get("life_span"))
+    temperament = normalize_text(b.get("temperament"), default="")
+    bred_for = normalize_text(b.get("bred_for"), default="")
+    narrative = _NARRATIVE.format(
+        name=name, origin=origin, region=region, group=group, bred_for=(bred_for or "Unknown").lower(),
+        temperament=temperament or "Varied", life_span=life_span, weight=weight, height=height, size=size,
+    )
+    details = (
+        f"### 🎭 Temperament\n{temperament or 'No temperament data.'}\n\n"
+        f"### 🧭 Original Role / Bred For\n{bred_for or 'No historical role data.'}\n\n"
+        f"### 🧑‍🎨 Curator Narrative\n{narrative}"
+    )
+    return ExhibitPanel(name, origin, region, group, life_span, height, weight, size, details)
@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+import metrics
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Request coalescing: while a call for `key` is in flight, identical calls
+    from other threads (i.e. other Streamlit sessions) wait for it and get
+    the same result or exception instead of hitting upstream again.
+
+    Metrics (label flight=<name>):
+      singleflight_leader_total         calls that actually ran
+      singleflight_coalesced_total      calls that joined an in-flight one
+      singleflight_wait_seconds_total   time joiners spent waiting
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            metrics.inc("singleflight_coalesced_total", flight=self.name)
+            t0 = time.perf_counter()
+            call.done.wait()
+            metrics.inc("singleflight_wait_seconds_total", time.perf_counter() - t0, flight=self.name)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        metrics.inc("singleflight_leader_total", flight=self.name)
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
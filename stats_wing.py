@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, Tuple
+
+import streamlit as st
+
+import metrics
+from breed_data import BreedTable
+from breed_stats import GROUP_BY, MAX_COMPARE, METRICS, BreedStats
+from breed_source import breeds_snapshot, get_breed_table
+
+# ----------------------------
+# Numeric columns + cached summaries (see breed_stats.py)
+# ----------------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def breed_stats(version: str, _table: BreedTable) -> BreedStats:
+    return BreedStats(_table)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def catalog_summary(version: str, metric: str, by: str, regions: Tuple[int, ...], groups: Tuple[int, ...],
+                    sizes: Tuple[int, ...], _stats: BreedStats) -> List[Dict[str, Any]]:
+    # One entry per filter set; a new snapshot version misses.
+    return _stats.summary(metric, by, _stats.mask(regions, groups, sizes))
+
+def _codes(labels: Tuple[str, ...], chosen: List[str]) -> Tuple[int, ...]:
+    return tuple(sorted(labels.index(v) for v in chosen if v in labels))
+
+# ----------------------------
+# Fragments
+# ----------------------------
+@st.fragment
+def compare_panel(table: BreedTable, stats: BreedStats):
+    with metrics.fragment_run("compare"):
+        picked = st.multiselect(f"Choose 2–{MAX_COMPARE} breeds to compare", table.names,
+                                max_selections=MAX_COMPARE, key="compare_breeds")
+        if len(picked) < 2:
+            st.info("Pick at least two breeds to see them side by side.")
+            metrics.lap("compare")
+            return
+        rows = [table.name_to_row[n] for n in picked]
+
+        st.markdown('<div class="glass">', unsafe_allow_html=True)
+        st.dataframe(stats.comparison(rows), hide_index=True, use_container_width=True)
+        st.caption("Percentiles rank each breed against every breed in the catalog with data.")
+        data = stats.chart_data(rows)
+        for col, metric in zip(st.columns(len(METRICS)), METRICS):
+            with col:
+                st.markdown(f"**{metric}**")
+                st.bar_chart(data, x="Breed", y=metric, height=260)
+        st.markdown("</div>", unsafe_allow_html=True)
+        metrics.lap("compare")
+
+
+@st.fragment
+def stats_panel(table: BreedTable, stats: BreedStats):
+    with metrics.fragment_run("catalog_stats"):
+        c1, c2 = st.columns(2)
+        metric = c1.selectbox("Measure", METRICS, key="stats_metric")
+        by = c2.selectbox("Grouped by", GROUP_BY, key="stats_by")
+
+        f1, f2, f3 = st.columns(3)
+        regions = f1.multiselect("Department", table.region_labels, key="stats_regions")
+        groups = f2.multiselect("Breed Group", table.group_labels, key="stats_groups")
+        sizes = f3.multiselect("Size", table.size_labels, key="stats_sizes")
+
+        rows = catalog_summary(table.version, metric, by, _codes(table.region_labels, regions),
+                               _codes(table.group_labels, groups), _codes(table.size_labels, sizes), stats)
+        if not rows:
+            st.warning("No breeds match these filters.")
+            metrics.lap("catalog_stats")
+            return
+
+        st.markdown('<div class="glass">', unsafe_allow_html=True)
+        total = sum(r["breeds"] for r in rows)
+        known = sum(r["with data"] for r in rows)
+        st.caption(f"{total} breeds · {known} with {metric.split(' (')[0].lower()} data")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        charted = [r for r in rows if r["median"] is not None]
+        if charted:
+            st.markdown(f"**Median {metric.lower()} by {by.lower()}**")
+            st.bar_chart({by: [r[by] for r in charted], "median": [r["median"] for r in charted]},
+                         x=by, y="median", height=320)
+        st.markdown("</div>", unsafe_allow_html=True)
+        metrics.lap("catalog_stats")
+
+# ----------------------------
+# Wing D: Compare & Statistics
+# ----------------------------
+def render():
+    snapshot = breeds_snapshot()
+    table = get_breed_table(snapshot.version, snapshot.data)
+    stats = breed_stats(table.version, table)
+    metrics.lap("data_prep")
+
+    st.markdown(
+        '<div class="glass"><h2>📊 Compare & Statistics Wing</h2>'
+        '<p style="opacity:0.9">Set breeds side by side and read the whole collection at a glance.</p></div>',
+        unsafe_allow_html=True
+    )
+
+    tab1, tab2 = st.tabs(["⚖️ Compare Breeds", "📈 Catalog Statistics"])
+    with tab1:
+        compare_panel(table, stats)
+    with tab2:
+        stats_panel(table, stats)
@@ -0,0 +1,124 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Generic, Optional, TypeVar
+
+import metrics
+from singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Snapshot(Generic[T]):
+    data: T
+    fetched_at: Optional[float]  # None => fallback, never fetched successfully
+    is_fallback: bool = False
+    version: str = ""  # content digest of `data`, empty for fallback
+
+    def age(self, now: Optional[float] = None) -> Optional[float]:
+        if self.fetched_at is None:
+            return None
+        return (now or time.time()) - self.fetched_at
+
+
+class SWRCache(Generic[T]):
+    """
+    Stale-while-revalidate holder for one value.
+
+    - `loader` returns a Snapshot so it can keep the original fetch time
+      and content version (e.g. when reading a snapshot another process wrote).
+    - An `initial` snapshot (e.g. from disk) is served right away, stale or not.
+    - Otherwise the first call loads synchronously (sessions arriving during
+      that load wait for it rather than starting their own); if that fails the fallback is returned
+      but NOT stored, and later calls keep retrying in the background.
+    - Once a good value exists it is always served immediately; after `ttl`
+      seconds a single background refresh replaces it on success.
+    - Failed refreshes keep the last good value; refreshes (of a stale value
+      or after a failed first load) start at most once per `retry_interval`.
+
+    Metric: swr_cache_requests_total{cache, result=fresh|stale|fallback}.
+    """
+
+    def __init__(self, loader: Callable[[], Snapshot[T]], ttl: float, fallback: T,
+                 retry_interval: float = 30.0, initial: Optional[Snapshot[T]] = None,
+                 name: str = "swr"):
+        self.loader = loader
+        self.name = name
+        self.ttl = ttl
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+
+        self._snap: Optional[Snapshot[T]] = initial
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0
+        self._tried_sync = False
+        self.last_error: Optional[BaseException] = None
+        self._flight = SingleFlight(name)
+
+    def _load(self) -> bool:
+        self._last_attempt = time.time()
+        try:
+            snap = self.loader()
+        except Exception as e:
+            self.last_error = e
+            return False
+        with self._lock:
+            self._snap = snap
+        self.last_error = None
+        return True
+
+    def _refresh_bg(self):
+        try:
+            self._load()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _kick(self):
+        # caller holds self._lock
+        if self._refreshing:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._refresh_bg, name="swr-refresh", daemon=True).start()
+
+    def _initial_load(self):
+        try:
+            self._load()
+        finally:
+            self._tried_sync = True
+
+    def get(self) -> Snapshot[T]:
+        with self._lock:
+            sync = self._snap is None and not self._tried_sync
+        if sync:
+            self._flight.do("initial", self._initial_load)
+
+        now = time.time()
+        with self._lock:
+            snap = self._snap
+            if snap is None:
+                if now - self._last_attempt >= self.retry_interval:
+                    self._kick()
+                result = "fallback"
+            elif now - (snap.fetched_at or 0) >= self.ttl:
+                if now - self._last_attempt >= self.retry_interval:
+                    self._kick()
+                result = "stale"
+            else:
+                result = "fresh"
+        metrics.inc("swr_cache_requests_total", cache=self.name, result=result)
+        return snap if snap is not None else Snapshot(data=self.fallback, fetched_at=None, is_fallback=True)
+
+
+def format_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "never refreshed"
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f} h ago"
+    return f"{seconds / 86400:.1f} days ago"
@@ -0,0 +1,96 @@
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triage import (  # noqa: E402
+    MED_BY_SYSTEM, NONSPECIFIC_FINDING, PHOTO_SIGNS, PhotoIndex, photo_heuristic, photo_heuristic_batch,
+)
+
+LEGACY_SIGNS = {
+    "Skin / Coat": {
+        "Red rash / bumps": ["Allergic dermatitis", "Insect bites", "Bacterial folliculitis"],
+        "Circular hair loss": ["Ringworm (fungal)", "Mite-related mange"],
+        "Oily skin / odor": ["Yeast dermatitis", "Seborrhea"],
+        "Ticks / fleas visible": ["Ectoparasite infestation"],
+    },
+    "Eyes": {
+        "Redness / swelling": ["Conjunctivitis", "Allergy flare", "Irritation/foreign body"],
+        "Thick discharge": ["Bacterial conjunctivitis", "Blocked tear ducts"],
+        "Cloudy surface": ["Corneal ulcer", "Cataract (needs vet exam)"],
+    },
+    "Ears": {
+        "Dark debris": ["Yeast/bacterial otitis", "Ear mites"],
+        "Strong odor": ["Otitis externa"],
+        "Red inflamed canal": ["Allergic ear inflammation", "Infection"],
+    },
+    "Mouth / Teeth": {
+        "Red gums / bleeding": ["Gingivitis / periodontal disease"],
+        "Broken tooth": ["Dental fracture (painful, needs vet)"],
+        "Heavy tartar": ["Dental calculus / periodontal risk"],
+    },
+    "Paws / Legs": {
+        "Swollen toe / pad": ["Paw injury", "Foreign body", "Interdigital cyst"],
+        "Bleeding nail": ["Nail trauma"],
+        "Licking constantly": ["Allergy-related paw dermatitis", "Pain"],
+    },
+    "Poop / Vomit": {
+        "Watery diarrhea": ["Acute gastroenteritis", "Diet intolerance"],
+        "Blood visible": ["Hemorrhagic diarrhea (urgent)", "Parvovirus risk in puppies"],
+        "Worms visible": ["Intestinal parasites"],
+    },
+}
+LEGACY_SYSTEMS = {
+    "Skin / Coat": "Skin / Allergy / Parasite", "Eyes": "Eyes/Ears", "Ears": "Eyes/Ears",
+    "Mouth / Teeth": "Oral / Dental",  # was "Eyes/Ears", corrected with the index
+    "Paws / Legs": "Musculoskeletal / Joint", "Poop / Vomit": "Digestive / GI",
+}
+
+
+def legacy_photo_heuristic(photo_type, signs):
+    """The if-chain photo_heuristic used before PhotoIndex (its system label fix applied)."""
+    possible, systems = [], []
+    if photo_type in LEGACY_SIGNS:
+        systems.append(LEGACY_SYSTEMS[photo_type])
+        for sign, conditions in LEGACY_SIGNS[photo_type].items():
+            if sign in signs:
+                possible += conditions
+    if not possible:
+        possible = [NONSPECIFIC_FINDING]
+    return sorted(set(possible)), sorted(set(systems))
+
+
+def all_sign_sets():
+    for photo_type, signs in PHOTO_SIGNS.items():
+        for r in range(len(signs) + 1):
+            for combo in itertools.combinations(signs, r):
+                yield photo_type, list(combo)
+
+
+def test_index_matches_legacy_chain():
+    # No condition is backed by two signs today, so ranking reduces to name order.
+    for photo_type, signs in all_sign_sets():
+        assert photo_heuristic(photo_type, signs) == legacy_photo_heuristic(photo_type, signs)
+    assert photo_heuristic("Not a type", ["Broken tooth"]) == ([NONSPECIFIC_FINDING], [])
+
+
+def test_batch_matches_single():
+    items = list(all_sign_sets())
+    random.Random(0).shuffle(items)
+    items += items[:50]  # repeats share one ranking
+    assert photo_heuristic_batch(items) == [photo_heuristic(t, s) for t, s in items]
+    assert photo_heuristic_batch([]) == []
+
+
+def test_multi_sign_ranking():
+    index = PhotoIndex({"Eyes": {"systems": ["Eyes/Ears"], "signs": {
+        "A": ["Zeta", "Beta"],
+        "B": ["Zeta", "Alpha"],
+        "C": ["Zeta", "Beta", "Gamma"],
+    }}}, MED_BY_SYSTEM)
+    expected = (("Zeta", 3), ("Beta", 2), ("Alpha", 1), ("Gamma", 1))
+    assert index.rank("Eyes", frozenset("ABC")) == expected
+    assert index.rank_batch([("Eyes", "ABC"), ("Eyes", "B"), ("Ears", "A")]) == [
+        expected, (("Alpha", 1), ("Zeta", 1)), ()]
@@ -0,0 +1,117 @@
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triage import triage  # noqa: E402
+from triage_rules import TriageRules, load_rules, triage_csv, triage_records  # noqa: E402
+
+SAFETY = "\n\n**Curator safety note:** This is general education only, not diagnosis or prescription."
+
+
+def legacy_triage(symptoms):
+    """The hard-coded chain triage() used before the rule table; the reference the rules must match."""
+    emergency_flags, soon_flags, systems = [], [], []
+
+    if symptoms["breathing_trouble"]: emergency_flags.append("Breathing trouble")
+    if symptoms["collapse_seizure"]: emergency_flags.append("Collapse/seizure")
+    if symptoms["bloated_hard_belly"]: emergency_flags.append("Bloated hard belly")
+    if symptoms["uncontrolled_bleeding"]: emergency_flags.append("Uncontrolled bleeding")
+    if symptoms["cannot_urinate"]: emergency_flags.append("Cannot urinate")
+    if symptoms["heatstroke_like"]: emergency_flags.append("Heatstroke signs")
+
+    if symptoms["vomit_diarrhea_hours"] >= 24: soon_flags.append("GI upset >24h")
+    if symptoms["appetite_loss_hours"] >= 24: soon_flags.append("No appetite >24h")
+    if symptoms["limping_hours"] >= 24: soon_flags.append("Limping >24h")
+    if symptoms["eye_ear_pain"]: soon_flags.append("Eye/Ear pain/discharge")
+    if symptoms["blood_in_stool_vomit"]: soon_flags.append("Blood in vomit/stool")
+
+    if symptoms["vomit_diarrhea_hours"] > 0: systems.append("Digestive / GI")
+    if symptoms["itch_skin"]: systems.append("Skin / Allergy / Parasite")
+    if symptoms["cough_sneeze"]: systems.append("Respiratory")
+    if symptoms["limping_hours"] > 0: systems.append("Musculoskeletal / Joint")
+    if symptoms["eye_ear_pain"]: systems.append("Eyes/Ears")
+    if symptoms["collapse_seizure"]: systems.append("Neurology")
+
+    if emergency_flags:
+        level = "🚨 Emergency — Go to vet/ER now"
+        note = ("Emergency signs detected. Online tools cannot diagnose or treat. "
+                "Please seek urgent veterinary care immediately.")
+    elif soon_flags:
+        level = "🟠 Vet Soon (within 24–48h)"
+        note = ("Symptoms suggest illness needing professional evaluation. "
+                "Contact a vet clinic soon.")
+    else:
+        level = "🟢 Monitor & Support"
+        note = "No clear emergency signs detected. Monitor closely and see a vet if symptoms persist."
+    return level, note + SAFETY, systems, emergency_flags + soon_flags
+
+
+def random_questionnaires(n, seed=1):
+    rules = load_rules()
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        out.append({f: (rng.choice([0, 1, 12, 23, 24, 25, 48, 72]) if kind == "hours" else rng.random() < 0.15)
+                    for f, kind in rules.fields.items()})
+    return out
+
+
+def test_rules_match_legacy_chain():
+    rules = load_rules()
+    for s in random_questionnaires(20_000):
+        level, note, systems, flags = legacy_triage(s)
+        assert triage(s) == (level, note, systems)
+        res = rules.evaluate(s)
+        assert sorted(res.flags) == sorted(flags)
+
+
+def test_batch_matches_single():
+    rules = load_rules()
+    recs = random_questionnaires(5_000, seed=2)
+    batch = triage_records(recs, rules)
+    assert len(batch) == len(recs)
+    for s, res in zip(recs, batch):
+        assert res == rules.evaluate(s)
+
+
+def test_empty_batch():
+    batch = load_rules().evaluate_batch({f: [] for f in load_rules().fields})
+    assert len(batch) == 0
+    assert list(batch) == []
+    assert batch.counts() == {"emergency": 0, "soon": 0, "monitor": 0}
+    assert len(load_rules().evaluate_batch({})) == 0
+
+
+def test_ragged_columns_rejected():
+    with pytest.raises(ValueError, match="differ in length"):
+        load_rules().evaluate_batch({"limping_hours": [1, 2], "itch_skin": [1]})
+
+
+def test_csv_header_only(tmp_path):
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    src.write_text("record,breathing_trouble,limping_hours\n", encoding="utf-8")
+    assert triage_csv(str(src), str(dst)) == {"emergency": 0, "soon": 0, "monitor": 0}
+    with open(dst, encoding="utf-8") as f:
+        assert next(csv.reader(f))[-3:] == ["triage_level", "triage_flags", "triage_systems"]
+
+
+def test_csv_parsing(tmp_path):
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    src.write_text("record,breathing_trouble,vomit_diarrhea_hours,itch_skin\n"
+                   "A,yes,0,\nB,,30,1\nC,no,,0\n", encoding="utf-8")
+    assert triage_csv(str(src), str(dst)) == {"emergency": 1, "soon": 1, "monitor": 1}
+    with open(dst, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["triage_level"] for r in rows] == ["emergency", "soon", "monitor"]
+    assert rows[1]["triage_systems"] == "Digestive / GI; Skin / Allergy / Parasite"
+
+
+def test_bad_rule_table():
+    with pytest.raises(ValueError, match="undeclared field"):
+        TriageRules({"levels": [{"id": "a", "label": "A", "note": ""}], "fields": {},
+                     "flags": [{"when": "nope", "level": "a", "flag": "x"}]})
@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from breed_data import BreedTable
+from breed_fetch import breed_images_cached
+from fetch_cache import CacheBackend
+
+
+class ThumbResolver:
+    """
+    Resolves thumbnails for every breed whose payload has no image, in one
+    concurrent batch started ahead of the first render.
+
+    Lookups go through the shared image-list cache (one image per breed),
+    so they are cached across processes and coalesced with identical
+    requests. Results are written into `table.thumb_urls`; rows that cannot
+    be resolved stay "" and the caller shows the bundled placeholder, so
+    building the card wall never waits on the network.
+    """
+
+    def __init__(self, table: BreedTable, cache: CacheBackend, fetch: bool = True, workers: int = 3):
+        self.table = table
+        self.cache = cache
+        self.fetch = fetch
+        self.workers = workers
+        self.missing: List[int] = [i for i, u in enumerate(table.thumb_urls) if not u]
+        self.resolved = 0
+        self.done = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        if not self.fetch or not self.missing:
+            self.done.set()
+            return
+        threading.Thread(target=self._run, name="thumb-resolver", daemon=True).start()
+
+    def _run(self):
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumb") as pool:
+                for row, url in zip(self.missing, pool.map(self._resolve, self.missing)):
+                    if url:
+                        self.table.thumb_urls[row] = url
+                        self.resolved += 1
+        finally:
+            self.done.set()
+
+    def _resolve(self, row: int) -> str:
+        breed_id = self.table.ids[row]
+        if not breed_id:
+            return ""
+        urls = breed_images_cached(self.cache, breed_id, 1)
+        return urls[0] if urls and isinstance(urls[0], str) else ""
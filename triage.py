@@ -0,0 +1,207 @@
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from triage_rules import load_rules
+
+# ----------------------------
+# Global Medication Knowledge (shown inside diagnosis)
+# Categories follow WSAVA essential med structure. :contentReference[oaicite:1]{index=1}
+MED_BY_SYSTEM = {
+    "Skin / Allergy / Parasite": [
+        ("Flea & Tick Control", ["Afoxolaner", "Fluralaner", "Sarolaner", "Fipronil"]),
+        ("Dewormers / Antiparasitics", ["Pyrantel", "Fenbendazole", "Praziquantel"]),
+        ("Allergy / Itch Control", ["Oclacitinib", "Lokivetmab", "Vet-guided antihistamines"]),
+        ("Antibiotics (if bacterial)", ["Cephalexin", "Amoxicillin–clavulanate"]),
+        ("Antifungals (if fungal/yeast)", ["Itraconazole", "Terbinafine"])
+    ],
+    "Eyes/Ears": [
+        ("Eye/Ear Drops (cause-specific)", ["Antibiotic drops", "Anti-inflammatory drops", "Artificial tears"]),
+        ("Antibiotics (if bacterial)", ["Amoxicillin–clavulanate", "Cephalexin"]),
+        ("Allergy control (if allergic)", ["Oclacitinib", "Lokivetmab"])
+    ],
+    "Oral / Dental": [],  # no sourced medication list yet
+    "Digestive / GI": [
+        ("Anti-nausea", ["Maropitant (Cerenia)"]),
+        ("GI protectants", ["Omeprazole", "Famotidine"]),
+        ("Antibiotics/Antiprotozoals (cause-specific)", ["Metronidazole"]),
+        ("Probiotics / Diet therapy", ["Vet-approved probiotics"])
+    ],
+    "Respiratory": [
+        ("Antibiotics (if bacterial)", ["Doxycycline", "Amoxicillin–clavulanate"]),
+        ("Cough control (vet decides)", ["Cause-specific meds"])
+    ],
+    "Musculoskeletal / Joint": [
+        ("Canine NSAIDs (prescription)", ["Carprofen", "Meloxicam", "Firocoxib"]),
+        ("Pain management adjuncts", ["Vet-guided options"])
+    ],
+    "Neurology": [
+        ("Anti-seizure (prescription)", ["Phenobarbital", "Levetiracetam", "Potassium bromide"])
+    ]
+}
+
+HUMAN_DRUG_WARNING = (
+    "⚠️ **Never give human painkillers like ibuprofen/naproxen/acetaminophen to dogs.** "
+    "They are toxic and can cause life-threatening reactions. "
+    "Use only vet-prescribed canine medications."
+)  # :contentReference[oaicite:2]{index=2}
+
+# ----------------------------
+# Triage + Diagnosis Heuristics
+# ----------------------------
+def triage(symptoms: Dict[str, Any]) -> Tuple[str, str, List[str]]:
+    """Rule table in triage_rules.json; bulk intake goes through triage_rules.triage_csv."""
+    result = load_rules().evaluate(symptoms)
+    return result.level, result.note, result.systems
+
+# ----------------------------
+# Photo analyzer: sign -> condition index
+# ----------------------------
+# Photo type -> related systems and visible signs, each sign with the conditions
+# it supports. Insertion order of the signs is the UI checklist order.
+PHOTO_FINDINGS: Dict[str, Dict[str, Any]] = {
+    "Skin / Coat": {"systems": ["Skin / Allergy / Parasite"], "signs": {
+        "Red rash / bumps": ["Allergic dermatitis", "Insect bites", "Bacterial folliculitis"],
+        "Circular hair loss": ["Ringworm (fungal)", "Mite-related mange"],
+        "Oily skin / odor": ["Yeast dermatitis", "Seborrhea"],
+        "Ticks / fleas visible": ["Ectoparasite infestation"],
+    }},
+    "Eyes": {"systems": ["Eyes/Ears"], "signs": {
+        "Redness / swelling": ["Conjunctivitis", "Allergy flare", "Irritation/foreign body"],
+        "Thick discharge": ["Bacterial conjunctivitis", "Blocked tear ducts"],
+        "Cloudy surface": ["Corneal ulcer", "Cataract (needs vet exam)"],
+        "Squinting / closed eye": [],
+    }},
+    "Ears": {"systems": ["Eyes/Ears"], "signs": {
+        "Dark debris": ["Yeast/bacterial otitis", "Ear mites"],
+        "Strong odor": ["Otitis externa"],
+        "Red inflamed canal": ["Allergic ear inflammation", "Infection"],
+        "Head shaking": [],
+    }},
+    "Mouth / Teeth": {"systems": ["Oral / Dental"], "signs": {
+        "Red gums / bleeding": ["Gingivitis / periodontal disease"],
+        "Broken tooth": ["Dental fracture (painful, needs vet)"],
+        "Heavy tartar": ["Dental calculus / periodontal risk"],
+        "Drooling a lot": [],
+    }},
+    "Paws / Legs": {"systems": ["Musculoskeletal / Joint"], "signs": {
+        "Swollen toe / pad": ["Paw injury", "Foreign body", "Interdigital cyst"],
+        "Bleeding nail": ["Nail trauma"],
+        "Licking constantly": ["Allergy-related paw dermatitis", "Pain"],
+        "Visible cut/wound": [],
+    }},
+    "Poop / Vomit": {"systems": ["Digestive / GI"], "signs": {
+        "Watery diarrhea": ["Acute gastroenteritis", "Diet intolerance"],
+        "Blood visible": ["Hemorrhagic diarrhea (urgent)", "Parvovirus risk in puppies"],
+        "Worms visible": ["Intestinal parasites"],
+        "Repeated vomiting": [],
+    }},
+    "Other / Unknown": {"systems": [], "signs": {
+        "Painful posture": [], "Large lump": [], "Unknown change": [],
+    }},
+}
+PHOTO_SIGNS: Dict[str, List[str]] = {t: list(spec["signs"]) for t, spec in PHOTO_FINDINGS.items()}
+NONSPECIFIC_FINDING = "Non-specific abnormality — needs vet confirmation"
+
+
+class PhotoIndex:
+    """
+    Per photo type: a sign x condition incidence matrix, so a set of ticked
+    signs ranks conditions by how many of them support each one (ties by
+    name). Systems use the MED_BY_SYSTEM keys, checked once here, so the
+    medication lookup never silently misses.
+    """
+
+    def __init__(self, findings: Dict[str, Dict[str, Any]], meds: Dict[str, list]):
+        self.sign_pos: Dict[str, Dict[str, int]] = {}
+        self.conditions: Dict[str, Tuple[str, ...]] = {}
+        self.support: Dict[str, np.ndarray] = {}    # (n_signs, n_conditions) 0/1
+        self.systems: Dict[str, Tuple[str, ...]] = {}
+        for photo_type, spec in findings.items():
+            signs = spec["signs"]
+            conds = tuple(sorted({c for cs in signs.values() for c in cs}))
+            col = {c: j for j, c in enumerate(conds)}
+            m = np.zeros((len(signs), len(conds)), dtype=np.int32)
+            for i, cs in enumerate(signs.values()):
+                m[i, [col[c] for c in cs]] = 1
+            self.sign_pos[photo_type] = {s: i for i, s in enumerate(signs)}
+            self.conditions[photo_type] = conds
+            self.support[photo_type] = m
+            unknown = set(spec["systems"]) - set(meds)
+            if unknown:
+                raise ValueError(f"photo type {photo_type!r}: unknown systems {sorted(unknown)}")
+            self.systems[photo_type] = tuple(sorted(set(spec["systems"])))
+
+    def _ranked(self, photo_type: str, counts: np.ndarray) -> Tuple[Tuple[str, int], ...]:
+        conds = self.conditions[photo_type]
+        hit = np.flatnonzero(counts)
+        # Conditions are stored sorted by name, so a stable sort on -count keeps name order for ties.
+        order = hit[np.argsort(-counts[hit], kind="stable")]
+        return tuple((conds[j], int(counts[j])) for j in order)
+
+    def rank(self, photo_type: str, signs: FrozenSet[str]) -> Tuple[Tuple[str, int], ...]:
+        """(condition, supporting sign count), best supported first."""
+        pos = self.sign_pos.get(photo_type)
+        if not pos:
+            return ()
+        rows = [pos[s] for s in signs if s in pos]
+        if not rows:
+            return ()
+        return self._ranked(photo_type, self.support[photo_type][rows].sum(axis=0))
+
+    def rank_batch(self, items: Sequence[Tuple[str, Iterable[str]]]) -> List[Tuple[Tuple[str, int], ...]]:
+        """Many sign sets at once: one matrix product per photo type."""
+        out: List[Tuple[Tuple[str, int], ...]] = [()] * len(items)
+        by_type: Dict[str, List[int]] = {}
+        for k, (photo_type, _) in enumerate(items):
+            if self.sign_pos.get(photo_type):
+                by_type.setdefault(photo_type, []).append(k)
+        for photo_type, ks in by_type.items():
+            pos = self.sign_pos[photo_type]
+            picked = np.zeros((len(ks), len(pos)), dtype=np.int32)
+            for r, k in enumerate(ks):
+                picked[r, [pos[s] for s in set(items[k][1]) if s in pos]] = 1
+            counts = picked @ self.support[photo_type]
+            for r, k in enumerate(ks):
+                out[k] = self._ranked(photo_type, counts[r])
+        return out
+
+
+PHOTO_INDEX = PhotoIndex(PHOTO_FINDINGS, MED_BY_SYSTEM)
+
+
+def meds_for_systems(systems: Iterable[str]) -> List[Tuple[str, list]]:
+    """(system, medication categories) for systems that have any."""
+    return [(s, MED_BY_SYSTEM[s]) for s in systems if MED_BY_SYSTEM.get(s)]
+
+
+@lru_cache(maxsize=1024)
+def _photo_findings(photo_type: str, signs: FrozenSet[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    ranked = PHOTO_INDEX.rank(photo_type, signs)
+    possible = tuple(c for c, _ in ranked) or (NONSPECIFIC_FINDING,)
+    return possible, PHOTO_INDEX.systems.get(photo_type, ())
+
+
+def photo_heuristic(photo_type: str, signs: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Returns (possible_conditions, related_systems), conditions ranked by how
+    many of the ticked signs support them.
+    NOTE: heuristic only, not real diagnosis.
+    """
+    possible, systems = _photo_findings(photo_type, frozenset(signs))
+    return list(possible), list(systems)
+
+
+def photo_heuristic_batch(items: Sequence[Tuple[str, Iterable[str]]]) -> List[Tuple[List[str], List[str]]]:
+    """
+    photo_heuristic over many (photo_type, signs) pairs. Each distinct sign
+    set is ranked once, vectorized per photo type, and shared by its repeats.
+    """
+    keys = [(photo_type, frozenset(signs)) for photo_type, signs in items]
+    distinct = list(dict.fromkeys(keys))
+    found = {}
+    for (photo_type, signs), ranked in zip(distinct, PHOTO_INDEX.rank_batch(distinct)):
+        found[photo_type, signs] = ([c for c, _ in ranked] or [NONSPECIFIC_FINDING],
+                                    list(PHOTO_INDEX.systems.get(photo_type, ())))
+    return [(list(found[k][0]), list(found[k][1])) for k in keys]
@@ -0,0 +1,248 @@
+import argparse
+import csv
+import json
+import operator
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ----------------------------
+# Declarative triage rules (see triage_rules.json)
+# ----------------------------
+# A rule's "when" is either a field name (true when non-zero / ticked) or
+# "<field> <op> <number>", e.g. "limping_hours >= 24".
+RULES_PATH = os.environ.get(
+    "TRIAGE_RULES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "triage_rules.json"),
+)
+FIELD_KINDS = ("flag", "hours")
+TRUTHY = frozenset(("1", "true", "yes", "y", "x", "on"))
+
+_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    ">=": operator.ge, ">": operator.gt, "<=": operator.le,
+    "<": operator.lt, "==": operator.eq, "!=": operator.ne,
+}
+_COND = re.compile(r"^\s*([A-Za-z_]\w*)\s*(?:(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?))?\s*$")
+
+
+class TriageResult(NamedTuple):
+    level: str          # display label, e.g. "🟠 Vet Soon (within 24–48h)"
+    note: str           # level note + safety note
+    flags: List[str]
+    systems: List[str]
+    level_id: str       # "emergency" / "soon" / "monitor"
+
+
+class TriageRules:
+    """
+    Rule table compiled once into flat condition tuples.
+
+    Each distinct condition is evaluated once per questionnaire and shared by
+    the flag and system rules that use it. Levels are listed most severe
+    first; a questionnaire gets the most severe level any of its flags
+    carries, or the last level when no flag fires.
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        try:
+            levels = spec["levels"]
+            self.fields: Dict[str, str] = dict(spec["fields"])
+            flag_specs = spec.get("flags", [])
+            system_specs = spec.get("systems", [])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"triage rules: missing section {e}") from e
+        if not levels:
+            raise ValueError("triage rules: at least one level is required")
+        for f, kind in self.fields.items():
+            if kind not in FIELD_KINDS:
+                raise ValueError(f"triage rules: field {f!r} has unknown kind {kind!r}")
+
+        self.level_ids: Tuple[str, ...] = tuple(lv["id"] for lv in levels)
+        self.level_labels: Tuple[str, ...] = tuple(lv["label"] for lv in levels)
+        safety = spec.get("safety_note", "")
+        self.level_notes: Tuple[str, ...] = tuple(
+            lv["note"] + (f"\n\n{safety}" if safety else "") for lv in levels
+        )
+        self.default_level = len(levels) - 1
+
+        self._conds: List[Tuple[str, Callable[[Any, Any], Any], float]] = []
+        index: Dict[Tuple[str, str, float], int] = {}
+
+        def cond(text: str) -> int:
+            m = _COND.match(text)
+            if not m:
+                raise ValueError(f"triage rules: cannot parse condition {text!r}")
+            field, op, value = m.group(1), m.group(2) or "!=", float(m.group(3) or 0)
+            if field not in self.fields:
+                raise ValueError(f"triage rules: condition {text!r} uses undeclared field {field!r}")
+            key = (field, op, value)
+            if key not in index:
+                index[key] = len(self._conds)
+                self._conds.append((field, _OPS[op], value))
+            return index[key]
+
+        level_of = {lid: i for i, lid in enumerate(self.level_ids)}
+        flags = []
+        for r in flag_specs:
+            if r.get("level") not in level_of:
+                raise ValueError(f"triage rules: flag {r.get('flag')!r} has unknown level {r.get('level')!r}")
+            flags.append((cond(r["when"]), level_of[r["level"]], r["flag"]))
+        self._flags: Tuple[Tuple[int, int, str], ...] = tuple(flags)
+        self._systems: Tuple[Tuple[int, str], ...] = tuple((cond(r["when"]), r["system"]) for r in system_specs)
+
+        # Column form of the same rules for batch evaluation.
+        self._flag_conds = np.array([c for c, _, _ in self._flags], dtype=np.intp)
+        self._flag_levels = np.array([lv for _, lv, _ in self._flags], dtype=np.intp)
+        self._system_conds = np.array([c for c, _ in self._systems], dtype=np.intp)
+        self.flag_names: Tuple[str, ...] = tuple(f for _, _, f in self._flags)
+        self.system_names: Tuple[str, ...] = tuple(s for _, s in self._systems)
+
+    @classmethod
+    def from_file(cls, path: str) -> "TriageRules":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def evaluate(self, symptoms: Mapping[str, Any]) -> TriageResult:
+        """One questionnaire; missing fields count as 0 / unticked."""
+        hits = [op(float(symptoms.get(field) or 0), value) for field, op, value in self._conds]
+        level = self.default_level
+        flags = []
+        for c, lv, name in self._flags:
+            if hits[c]:
+                flags.append(name)
+                if lv < level:
+                    level = lv
+        systems = [name for c, name in self._systems if hits[c]]
+        return TriageResult(self.level_labels[level], self.level_notes[level], flags, systems,
+                            self.level_ids[level])
+
+    def evaluate_batch(self, columns: Mapping[str, Sequence[Any]]) -> "TriageBatch":
+        """
+        Many questionnaires at once, given as {field: column}. Every rule is
+        one vectorized comparison over its column.
+        """
+        lengths = {f: len(columns[f]) for f in self.fields if f in columns}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"triage rules: columns differ in length {lengths}")
+        n = next(iter(lengths.values()), 0)
+        hits = np.zeros((len(self._conds), n), dtype=bool)
+        if n:
+            zeros = np.zeros(n)
+            data = {f: np.asarray(columns[f], dtype=float) if f in columns else zeros for f in self.fields}
+            for c, (field, op, value) in enumerate(self._conds):
+                hits[c] = op(data[field], value)
+
+        flag_hits = hits[self._flag_conds]
+        levels = np.full(n, self.default_level, dtype=np.intp)
+        for lv in range(self.default_level - 1, -1, -1):  # most severe last, so it wins
+            fired = flag_hits[self._flag_levels == lv]
+            if len(fired):
+                levels[fired.any(axis=0)] = lv
+        return TriageBatch(self, levels, flag_hits, hits[self._system_conds])
+
+
+class TriageBatch:
+    """Results of TriageRules.evaluate_batch; rows are materialized lazily."""
+
+    def __init__(self, rules: TriageRules, levels: np.ndarray, flag_hits: np.ndarray, system_hits: np.ndarray):
+        self.rules = rules
+        self.levels = levels            # level index per questionnaire
+        self.flag_hits = flag_hits      # (n_flags, n) bool
+        self.system_hits = system_hits  # (n_systems, n) bool
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def level_ids(self) -> List[str]:
+        ids = self.rules.level_ids
+        return [ids[i] for i in self.levels]
+
+    def counts(self) -> Dict[str, int]:
+        per = np.bincount(self.levels, minlength=len(self.rules.level_ids))
+        return {lid: int(c) for lid, c in zip(self.rules.level_ids, per)}
+
+    def result(self, i: int) -> TriageResult:
+        r = self.rules
+        lv = int(self.levels[i])
+        return TriageResult(
+            r.level_labels[lv], r.level_notes[lv],
+            [r.flag_names[j] for j in np.flatnonzero(self.flag_hits[:, i])],
+            [r.system_names[j] for j in np.flatnonzero(self.system_hits[:, i])],
+            r.level_ids[lv],
+        )
+
+    def __iter__(self) -> Iterator[TriageResult]:
+        return (self.result(i) for i in range(len(self)))
+
+
+@lru_cache(maxsize=4)
+def load_rules(path: str = RULES_PATH) -> TriageRules:
+    return TriageRules.from_file(path)
+
+# ----------------------------
+# Intake records (CSV / dicts)
+# ----------------------------
+def parse_value(kind: str, raw: Any) -> float:
+    if raw is None:
+        return 0.0
+    if isinstance(raw, str):
+        raw = raw.strip()
+        if kind == "flag":
+            return 1.0 if raw.lower() in TRUTHY else 0.0
+        try:
+            return float(raw) if raw else 0.0
+        except ValueError:
+            return 0.0
+    return float(raw)
+
+
+def columns_from_records(records: Iterable[Mapping[str, Any]], rules: TriageRules) -> Dict[str, List[float]]:
+    cols: Dict[str, List[float]] = {f: [] for f in rules.fields}
+    for rec in records:
+        for f, kind in rules.fields.items():
+            cols[f].append(parse_value(kind, rec.get(f)))
+    return cols
+
+
+def triage_records(records: Sequence[Mapping[str, Any]], rules: Optional[TriageRules] = None) -> TriageBatch:
+    rules = rules or load_rules()
+    return rules.evaluate_batch(columns_from_records(records, rules))
+
+
+def triage_csv(src: str, dst: str, rules: Optional[TriageRules] = None) -> Dict[str, int]:
+    """
+    Bulk-triage an intake CSV (one questionnaire per row, columns named after
+    the rule fields). Writes the input columns plus triage_level, triage_flags
+    and triage_systems; returns the count per level.
+    """
+    rules = rules or load_rules()
+    with open(src, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        header = list(reader.fieldnames or [])
+        rows = list(reader)
+    batch = triage_records(rows, rules)
+    with open(dst, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header + ["triage_level", "triage_flags", "triage_systems"])
+        for row, res in zip(rows, batch):
+            writer.writerow([row.get(h, "") for h in header]
+                            + [res.level_id, "; ".join(res.flags), "; ".join(res.systems)])
+    return batch.counts()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    ap = argparse.ArgumentParser(description="Bulk-triage intake questionnaires")
+    ap.add_argument("src", help="intake CSV")
+    ap.add_argument("-o", "--out", required=True, help="output CSV")
+    ap.add_argument("--rules", default=RULES_PATH, help="rule table (JSON)")
+    args = ap.parse_args(argv)
+    counts = triage_csv(args.src, args.out, TriageRules.from_file(args.rules))
+    print(", ".join(f"{k}: {v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())